@@ -0,0 +1,287 @@
+"""
+Benchmark hors ligne d'un cycle complet de FluxMonitor.get_all_data
+
+Un serveur local (standin.py), lancé dans un processus séparé, sert un
+réseau synthétique ou des réponses enregistrées. Pour chaque taille de
+réseau et de flotte, trois phases sont mesurées :
+- cold : premier cycle d'un moniteur neuf ;
+- revalidate : cycle suivant avec toutes les entrées du cache expirées
+  (requêtes conditionnelles) ;
+- warm : cycle suivant avec le cache encore frais.
+
+Pour chaque phase : durée du cycle, nombre de requêtes HTTP, octets reçus,
+pic mémoire Python (tracemalloc) et blocage de la boucle asyncio : retard
+cumulé et maximal d'une tâche qui se réveille toutes les millisecondes, et
+temps CPU cumulé et maximal passé sur la boucle entre deux réveils. Le
+retard maximal et le temps CPU maximal sont rappelés en fin de benchmark :
+le décodage dans l'executor n'occupe pas la boucle, mais la concurrence
+pour le GIL retarde quand même ses réveils. --max-loop-cpu et
+--max-loop-lag font échouer le benchmark si une phase dépasse ces bornes.
+
+Exemples :
+    python benchmarks/bench_refresh.py --network 1000,10000,50000 --fleet 1,100,500
+    python benchmarks/bench_refresh.py --network 10000 --fleet 50 --direct
+    python benchmarks/bench_refresh.py --network 50000 --fleet 100 --max-loop-cpu 20
+    python benchmarks/bench_refresh.py --record fixtures/ --wallet t1... --nodes 1.2.3.4:16127
+    python benchmarks/bench_refresh.py --replay fixtures/ --wallet t1... --nodes 1.2.3.4:16127
+
+La mesure mémoire ralentit le décodage ; --no-memory donne des durées non
+faussées. Home Assistant n'est pas nécessaire : seul le client de l'intégration est
+importé.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+import aiohttp
+
+import standin
+
+PACKAGE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, 'custom_components', 'flux_monitor'
+)
+PORT = 18765
+# Période de la tâche qui mesure le blocage de la boucle (secondes)
+LAG_INTERVAL = 0.001
+
+PHASES = ("cold", "revalidate", "warm")
+
+
+def load_flux_api():
+    """Importe le client sans exécuter __init__.py (qui dépend de Home Assistant)"""
+    package = types.ModuleType('flux_monitor')
+    package.__path__ = [PACKAGE_DIR]
+    sys.modules['flux_monitor'] = package
+    return importlib.import_module('flux_monitor.flux_api')
+
+
+class LoopLagMonitor:
+    """
+    Mesure le temps pendant lequel la boucle asyncio n'a pas pu reprendre la main
+
+    Le retard (horloge murale) inclut l'attente du GIL et, sur une machine
+    chargée, le temps CPU pris par d'autres processus, dont le serveur local.
+    Le temps CPU du thread de la boucle pendant chaque attente ne compte que
+    le travail exécuté sur la boucle elle-même.
+    """
+
+    def __init__(self, interval=LAG_INTERVAL):
+        self.interval = interval
+        self.total = 0.0
+        self.max = 0.0
+        self.cpu_total = 0.0
+        self.cpu_max = 0.0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            cpu_start = time.thread_time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            cpu = time.thread_time() - cpu_start
+            if lag > 0:
+                self.total += lag
+                self.max = max(self.max, lag)
+            self.cpu_total += cpu
+            self.cpu_max = max(self.cpu_max, cpu)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+async def server_stats(session, base, reset=False):
+    """Lit (ou remet à zéro) les compteurs du serveur"""
+    if reset:
+        async with session.post(f"{base}/_reset"):
+            return None
+    async with session.get(f"{base}/_stats") as response:
+        return await response.json()
+
+
+async def run_phase(flux_api, monitor, session, base):
+    """Mesure un cycle complet"""
+    await server_stats(session, base, reset=True)
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    with LoopLagMonitor() as lag:
+        start = time.perf_counter()
+        data = await monitor.get_all_data()
+        elapsed = time.perf_counter() - start
+
+    stats = await server_stats(session, base)
+    return {
+        'seconds': elapsed,
+        'requests': sum(stats['requests'].values()),
+        'by_endpoint': stats['requests'],
+        'bytes': stats['bytes'],
+        'peak_mb': (tracemalloc.get_traced_memory()[1] - baseline) / 1e6 if tracemalloc.is_tracing() else None,
+        'lag_total_ms': lag.total * 1000,
+        'lag_max_ms': lag.max * 1000,
+        'loop_cpu_ms': lag.cpu_total * 1000,
+        'loop_cpu_max_ms': lag.cpu_max * 1000,
+        'nodes': len(data['nodes']),
+    }
+
+
+async def bench(flux_api, base, wallet, node_ips, direct):
+    """Mesure les trois phases pour un moniteur"""
+    results = {}
+    ttls, default_ttl = flux_api.ENDPOINT_TTLS, flux_api.DEFAULT_TTL
+    async with aiohttp.ClientSession() as session:
+        monitor = flux_api.FluxMonitor(wallet, list(node_ips), direct_polling=direct)
+        try:
+            for phase in PHASES:
+                if phase == "cold":
+                    # TTL nul : les réponses du premier cycle sont mises en cache
+                    # déjà expirées, le cycle suivant les revalide
+                    flux_api.ENDPOINT_TTLS, flux_api.DEFAULT_TTL = (), 0
+                else:
+                    flux_api.ENDPOINT_TTLS, flux_api.DEFAULT_TTL = ttls, default_ttl
+                results[phase] = await run_phase(flux_api, monitor, session, base)
+        finally:
+            flux_api.ENDPOINT_TTLS, flux_api.DEFAULT_TTL = ttls, default_ttl
+            await monitor.close()
+    return results
+
+
+def start_server(**options):
+    """Lance le serveur local dans un processus séparé"""
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(
+        target=standin.serve, args=(PORT, ready), kwargs=options, daemon=True
+    )
+    process.start()
+    if not ready.wait(600):
+        process.terminate()
+        raise RuntimeError("le serveur local n'a pas démarré")
+    return process
+
+
+def point_client_at(flux_api, base):
+    """Redirige toutes les API du client vers le serveur local"""
+    flux_api.FLUXNODES_API = f"{base}/flux"
+    flux_api.EXPLORER_API = f"{base}/explorer"
+    flux_api.COINGECKO_API = f"{base}/coingecko"
+    flux_api.node_api_url = lambda node_ip: f"{base}/node/{node_ip}"
+
+
+def print_results(label, results, verbose):
+    for phase, result in results.items():
+        peak = f"{result['peak_mb']:.1f}" if result['peak_mb'] is not None else "-"
+        print(
+            f"{label:<28} {phase:<10} {result['seconds'] * 1000:>9.1f} ms "
+            f"{result['requests']:>6} req {result['bytes'] / 1e6:>9.2f} MB "
+            f"{peak:>8} MB peak "
+            f"{result['lag_total_ms']:>8.1f} ms blocked (max {result['lag_max_ms']:.1f}) "
+            f"{result['loop_cpu_ms']:>8.1f} ms loop CPU (max {result['loop_cpu_max_ms']:.1f}) "
+            f"{result['nodes']:>4} nodes"
+        )
+        if verbose:
+            print(f"{'':<28} {json.dumps(result['by_endpoint'], sort_keys=True)}")
+
+
+def check_loop(all_results, max_loop_cpu, max_loop_lag):
+    """
+    Affiche le pire blocage de la boucle, en temps CPU et en retard
+
+    Code de sortie : 1 si une phase dépasse l'une des bornes données.
+    """
+    results = [result for phases in all_results for result in phases.values()]
+    worst_cpu = max(result['loop_cpu_max_ms'] for result in results)
+    worst_lag = max(result['lag_max_ms'] for result in results)
+    failed = False
+    for label, worst, bound in (
+        ("boucle occupée (CPU)", worst_cpu, max_loop_cpu),
+        ("boucle retardée (horloge)", worst_lag, max_loop_lag),
+    ):
+        limit = f" (borne {bound:.1f} ms)" if bound is not None else ""
+        print(f"{label} : au plus {worst:.1f} ms d'affilée{limit}")
+        failed = failed or (bound is not None and worst > bound)
+    return 1 if failed else 0
+
+
+def parse_sizes(value):
+    return [int(size) for size in value.split(',') if size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--network', type=parse_sizes, default=[1000, 10000, 50000],
+                        help="tailles du réseau synthétique (ex: 1000,10000,50000)")
+    parser.add_argument('--fleet', type=parse_sizes, default=[1, 10, 100, 500],
+                        help="nombres de nodes configurés (ex: 1,100,500)")
+    parser.add_argument('--direct', action='store_true',
+                        help="interroger l'API FluxOS de chaque node")
+    parser.add_argument('--record', metavar='DIR',
+                        help="relayer vers les vraies API et enregistrer les réponses dans DIR")
+    parser.add_argument('--replay', metavar='DIR',
+                        help="rejouer les réponses enregistrées dans DIR, sans réseau")
+    parser.add_argument('--wallet', default=standin.WALLET_ADDRESS,
+                        help="adresse du wallet (modes record et replay)")
+    parser.add_argument('--nodes', default='',
+                        help="IPs des nodes séparées par des virgules (modes record et replay)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="ne pas mesurer la mémoire (tracemalloc ralentit le décodage)")
+    parser.add_argument('--max-loop-cpu', type=float, metavar='MS',
+                        help="échouer si la boucle reste occupée plus de MS ms d'affilée")
+    parser.add_argument('--max-loop-lag', type=float, metavar='MS',
+                        help="échouer si la boucle reprend la main avec plus de MS ms de retard")
+    parser.add_argument('--verbose', action='store_true',
+                        help="afficher le nombre de requêtes par endpoint")
+    args = parser.parse_args()
+
+    flux_api = load_flux_api()
+    base = f"http://127.0.0.1:{PORT}"
+    point_client_at(flux_api, base)
+    if not args.no_memory:
+        tracemalloc.start()
+
+    print(f"{'scenario':<28} {'phase':<10} {'latency':>12} {'requests':>10} {'received':>12}")
+
+    if args.record or args.replay:
+        fixtures = args.record or args.replay
+        node_ips = [ip.strip() for ip in args.nodes.split(',') if ip.strip()]
+        server = start_server(fixtures=fixtures, record=bool(args.record))
+        try:
+            results = asyncio.run(bench(flux_api, base, args.wallet, node_ips, args.direct))
+        finally:
+            server.terminate()
+        mode = 'record' if args.record else 'replay'
+        print_results(f"{mode} fleet={len(node_ips)}", results, args.verbose)
+        sys.exit(check_loop([results], args.max_loop_cpu, args.max_loop_lag))
+
+    all_results = []
+    for network_size in args.network:
+        for fleet_size in args.fleet:
+            if fleet_size > network_size:
+                continue
+            node_ips = [standin.node_ip(index) for index in range(fleet_size)]
+            server = start_server(network_size=network_size, fleet_size=fleet_size)
+            try:
+                results = asyncio.run(
+                    bench(flux_api, base, standin.WALLET_ADDRESS, node_ips, args.direct)
+                )
+            finally:
+                server.terminate()
+                server.join()
+            print_results(f"network={network_size} fleet={fleet_size}", results, args.verbose)
+            all_results.append(results)
+    sys.exit(check_loop(all_results, args.max_loop_cpu, args.max_loop_lag))
+
+
+if __name__ == '__main__':
+    main()
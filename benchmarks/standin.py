@@ -0,0 +1,329 @@
+"""
+Serveur local imitant les API utilisées par Flux Monitor
+
+Trois modes :
+- synthétique : liste des nodes, benchmarks, hauteur de bloc, transactions
+  du wallet, prix et API FluxOS des nodes générés pour une taille de réseau
+  et de flotte données ;
+- enregistrement : chaque requête est relayée vers la vraie API et la
+  réponse est écrite dans un répertoire de fixtures ;
+- rejeu : les réponses sont relues depuis ces fixtures, sans réseau.
+
+Chaque API est servie sous un préfixe (/flux, /explorer, /coingecko,
+/node/<ip:port>) ; le serveur compte les requêtes et les octets envoyés,
+lisibles sur /_stats et remis à zéro par /_reset.
+"""
+import asyncio
+from collections import Counter
+import hashlib
+import json
+import os
+import random
+import time
+from urllib.parse import urlencode
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+WALLET_ADDRESS = "t1BenchWalletAddress000000000000000"
+BLOCK_HEIGHT = 1_500_000
+TIERS = ("CUMULUS", "NIMBUS", "STRATUS")
+# Taille des pages de transactions de l'explorer
+TX_PAGE_SIZE = 10
+
+# Paramètres dépendant de l'heure de la requête (plage de l'historique des
+# prix) : ignorés pour nommer et retrouver une fixture, qui se rejoue ainsi
+# n'importe quel jour
+VOLATILE_PARAMS = ('from', 'to')
+
+# Préfixe local -> API réelle (mode enregistrement)
+UPSTREAMS = {
+    "/flux": "https://api.runonflux.io",
+    "/explorer": "https://explorer.runonflux.io/api",
+    "/coingecko": "https://api.coingecko.com/api/v3",
+}
+
+
+def node_ip(index):
+    """IP:port du node synthétique d'index donné"""
+    return f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}:16127"
+
+
+def make_network(network_size, fleet_size, seed=0):
+    """
+    Génère la liste des nodes et les benchmarks d'un réseau synthétique
+
+    Les fleet_size premiers nodes sont payés au wallet du benchmark.
+    """
+    rng = random.Random(seed)
+    nodes = []
+    benchmarks = []
+    for index in range(network_size):
+        ip = node_ip(index)
+        tier = TIERS[index % len(TIERS)]
+        txhash = hashlib.sha256(str(index).encode()).hexdigest()
+        confirmed = rng.randint(BLOCK_HEIGHT - 500_000, BLOCK_HEIGHT - 10)
+        last_confirmed = BLOCK_HEIGHT - rng.randint(1, 80)
+        last_paid = rng.randint(confirmed, BLOCK_HEIGHT)
+        nodes.append({
+            'collateral': f"COutPoint({txhash}, 0)",
+            'txhash': txhash,
+            'outidx': '0',
+            'ip': ip,
+            'network': '',
+            'added_height': confirmed - 2,
+            'addedheight': confirmed - 2,
+            'confirmed_height': confirmed,
+            'confirmedheight': confirmed,
+            'last_confirmed_height': last_confirmed,
+            'lastconfirmedheight': last_confirmed,
+            'last_paid_height': last_paid,
+            'lastpaidheight': last_paid,
+            'tier': tier,
+            'payment_address': WALLET_ADDRESS if index < fleet_size else f"t1Other{index:028d}",
+            'pubkey': '04' + txhash * 2,
+            'activesince': str(1_600_000_000 + index),
+            'lastpaid': str(1_700_000_000 + index),
+            'amount': {'CUMULUS': '1000.00', 'NIMBUS': '12500.00', 'STRATUS': '40000.00'}[tier],
+            'rank': index // len(TIERS),
+        })
+        benchmarks.append(node_benchmark(ip, tier, rng))
+    return nodes, benchmarks
+
+
+def node_benchmark(ip, tier, rng):
+    """Entrée synthétique de /flux/benchmarks"""
+    return {
+        'ip': ip,
+        'flux': {'version': '5.30.0', 'arcaneVersion': '1.0.0'},
+        'bench': {
+            'version': '4.9.1',
+            'status': tier,
+            'cores': 8,
+            'ram': 32,
+            'ssd': 880,
+            'hdd': 0,
+            'ddwrite': round(rng.uniform(200, 2000), 2),
+            'eps': round(rng.uniform(200, 2000), 2),
+            'download': round(rng.uniform(100, 1000), 2),
+            'upload': round(rng.uniform(100, 1000), 2),
+            'time': 1_700_000_000,
+            'ping': round(rng.uniform(1, 50), 2),
+            'error': '',
+        },
+        'node': {'uptime': rng.randint(0, 5_000_000), 'status': 'CONFIRMED'},
+        'apps': [{'name': f"app{app}", 'hash': f"{app:064x}"} for app in range(rng.randint(0, 6))],
+    }
+
+
+def make_transactions(fleet_size, now=None, days=30):
+    """Paiements des nodes de la flotte sur la fenêtre, du plus récent au plus ancien"""
+    now = now or time.time()
+    count = max(1, fleet_size) * days
+    step = days * 86400 / count
+    txs = []
+    for index in range(count):
+        blocktime = int(now - index * step)
+        txs.append({
+            'txid': hashlib.sha256(f"tx{index}".encode()).hexdigest(),
+            'blocktime': blocktime,
+            'vout': [{
+                'value': '7.50000000',
+                'scriptPubKey': {'addresses': [WALLET_ADDRESS]},
+            }],
+        })
+    return txs
+
+
+class StandIn:
+    """Application aiohttp servant les réponses synthétiques ou enregistrées"""
+
+    def __init__(self, network_size=1000, fleet_size=1, fixtures=None, record=False):
+        self.fixtures = fixtures
+        self.record = record
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self.client = None
+        self.payloads = {}
+        self.etags = {}
+
+        if fixtures is None:
+            nodes, benchmarks = make_network(network_size, fleet_size)
+            self.payloads = {
+                '/flux/daemon/viewdeterministiczelnodelist': _encode({'status': 'success', 'data': nodes}),
+                '/flux/flux/benchmarks': _encode({'status': 'success', 'data': benchmarks}),
+                '/flux/daemon/getblockcount': _encode({'status': 'success', 'data': BLOCK_HEIGHT}),
+                f"/flux/flux/parallelassets/{WALLET_ADDRESS}": _encode({'status': 'success', 'data': []}),
+                f"/explorer/addr/{WALLET_ADDRESS}/balance": _encode(123_456_789_000),
+                '/coingecko/simple/price': _encode({'zelcash': {'eur': 0.42}}),
+            }
+            self.etags = {path: _etag(body) for path, body in self.payloads.items()}
+            self.benchmarks = {benchmark['ip']: benchmark for benchmark in benchmarks}
+            self.transactions = make_transactions(fleet_size)
+
+    def app(self):
+        """Construit l'application aiohttp"""
+        app = web.Application()
+        app.router.add_get('/_stats', self.stats)
+        app.router.add_post('/_reset', self.reset)
+        app.router.add_route('GET', '/{tail:.*}', self.handle)
+        app.on_cleanup.append(self._close)
+        return app
+
+    async def _close(self, app):
+        if self.client is not None:
+            await self.client.close()
+
+    async def stats(self, request):
+        return web.json_response({'requests': dict(self.requests), 'bytes': self.bytes_sent})
+
+    async def reset(self, request):
+        self.requests.clear()
+        self.bytes_sent = 0
+        return web.json_response({})
+
+    async def handle(self, request):
+        """Sert une requête, avec revalidation par ETag"""
+        self.requests[_endpoint(request.path)] += 1
+
+        if self.fixtures is not None and self.record:
+            status, body = await self._record(request)
+        elif self.fixtures is not None:
+            status, body = _load_fixture(self.fixtures, _fixture_key(request))
+        else:
+            status, body = self._synthetic(request)
+
+        etag = self.etags.get(request.path) or _etag(body)
+        if status == 200 and request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+
+        self.bytes_sent += len(body)
+        return web.Response(
+            status=status, body=body, content_type='application/json', headers={'ETag': etag}
+        )
+
+    def _synthetic(self, request):
+        """Réponse générée pour une requête"""
+        path = request.path
+        if path in self.payloads:
+            return 200, self.payloads[path]
+        if path == '/explorer/txs':
+            page = int(request.query.get('pageNum', 0))
+            start = page * TX_PAGE_SIZE
+            pages = -(-len(self.transactions) // TX_PAGE_SIZE)
+            txs = self.transactions[start:start + TX_PAGE_SIZE]
+            return 200, _encode({'pagesTotal': pages, 'txs': txs})
+        if path == '/coingecko/coins/zelcash/market_chart/range':
+            # Un point par heure, comme CoinGecko pour une plage de moins de 90 jours
+            start, end = int(request.query['from']), int(request.query['to'])
+            prices = [[timestamp * 1000, 0.42] for timestamp in range(start, end, 3600)]
+            return 200, _encode({'prices': prices})
+        if path.startswith('/node/'):
+            return self._node(path)
+        return 404, _encode({'status': 'error'})
+
+    def _node(self, path):
+        """Réponse de l'API FluxOS d'un node synthétique"""
+        _, _, ip, endpoint = path.split('/', 3)
+        benchmark = self.benchmarks.get(ip)
+        if benchmark is None:
+            return 404, _encode({'status': 'error'})
+        data = {
+            'benchmark/getbenchmarks': benchmark['bench'],
+            'benchmark/getinfo': {'version': benchmark['bench']['version']},
+            'flux/version': benchmark['flux']['version'],
+            'flux/uptime': benchmark['node']['uptime'],
+            'apps/listrunningapps': [{'Names': [f"/flux{app['name']}_{app['name']}"]} for app in benchmark['apps']],
+        }.get(endpoint)
+        if data is None:
+            return 404, _encode({'status': 'error'})
+        return 200, _encode({'status': 'success', 'data': data})
+
+    async def _record(self, request):
+        """Relaie une requête vers l'API réelle et enregistre la réponse"""
+        parts = request.path.split('/', 3)
+        if parts[1] == 'node':
+            # /node/<ip:port>/... est relayé vers l'API FluxOS du node
+            prefix = f"/node/{parts[2]}"
+            upstream = f"http://{parts[2]}"
+        else:
+            prefix = f"/{parts[1]}"
+            upstream = UPSTREAMS.get(prefix)
+        if upstream is None:
+            return 404, _encode({'status': 'error'})
+        if self.client is None:
+            self.client = ClientSession(timeout=ClientTimeout(total=120))
+
+        url = upstream + request.path_qs[len(prefix):]
+        async with self.client.get(url) as response:
+            status, body = response.status, await response.read()
+        _save_fixture(self.fixtures, _fixture_key(request), status, body)
+        return status, body
+
+
+def _encode(payload):
+    return json.dumps(payload).encode()
+
+
+def _etag(body):
+    return '"' + hashlib.md5(body).hexdigest() + '"'
+
+
+def _endpoint(path):
+    """Regroupe les chemins par endpoint pour les compteurs"""
+    if path.startswith('/node/'):
+        return '/node/*/' + path.split('/', 3)[3]
+    if path.startswith('/explorer/addr/'):
+        return '/explorer/addr/*'
+    if path.startswith('/flux/flux/parallelassets/'):
+        return '/flux/flux/parallelassets/*'
+    return path
+
+
+def _fixture_key(request):
+    """Requête sous laquelle une réponse est enregistrée, sans les paramètres volatils"""
+    query = [(key, value) for key, value in request.query.items() if key not in VOLATILE_PARAMS]
+    return request.path + (f"?{urlencode(query)}" if query else '')
+
+
+def _fixture_path(fixtures, key):
+    name = hashlib.sha1(key.encode()).hexdigest()[:20]
+    return os.path.join(fixtures, f"{name}.json")
+
+
+def _save_fixture(fixtures, key, status, body):
+    """Écrit une réponse enregistrée et met à jour l'index des fixtures"""
+    os.makedirs(fixtures, exist_ok=True)
+    fixture = {'request': key, 'status': status, 'body': body.decode('utf-8', errors='replace')}
+    with open(_fixture_path(fixtures, key), 'w') as file:
+        json.dump(fixture, file)
+
+    index_path = os.path.join(fixtures, 'index.json')
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path) as file:
+            index = json.load(file)
+    index[key] = os.path.basename(_fixture_path(fixtures, key))
+    with open(index_path, 'w') as file:
+        json.dump(index, file, indent=2, sort_keys=True)
+
+
+def _load_fixture(fixtures, key):
+    """Relit une réponse enregistrée, 404 si la requête n'a pas été enregistrée"""
+    try:
+        with open(_fixture_path(fixtures, key)) as file:
+            fixture = json.load(file)
+    except FileNotFoundError:
+        return 404, _encode({'status': 'error', 'message': f"no fixture for {key}"})
+    return fixture['status'], fixture['body'].encode()
+
+
+def serve(port, ready, **options):
+    """Lance le serveur (point d'entrée du processus du serveur)"""
+    async def main():
+        runner = web.AppRunner(StandIn(**options).app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', port).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
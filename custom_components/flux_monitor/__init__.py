@@ -1,25 +1,130 @@
 """The Flux Node Monitor integration."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
-from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator,
-    UpdateFailed,
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
 )
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.typing import ConfigType
 
-from .flux_api import FluxMonitor
+from .const import (
+    NETWORK,
+    NETWORK_SOURCES,
+    REFRESH_INTERVALS,
+    SNAPSHOT_SOURCES,
+    SOURCE_BALANCE,
+    SOURCE_BENCHMARKS,
+    SOURCE_NODES,
+    SOURCE_TRANSACTIONS,
+)
+from .coordinator import FluxBlockWatcher, FluxSourceCoordinator
+from .flux_api import FluxMonitor, FluxNetworkClient
+from .store import FluxNetworkStore, FluxSnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 DOMAIN = "flux_monitor"
 
-SCAN_INTERVAL = timedelta(minutes=5)
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+SERVICE_GET_DETAILS = "get_details"
+SERVICE_REFRESH_NODE = "refresh_node"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_NODE = "node"
+
+GET_DETAILS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_NODE): cv.string,
+    }
+)
+
+REFRESH_NODE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_NODE): cv.string,
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration services."""
+
+    def loaded_entries(call: ServiceCall) -> dict[str, dict[str, Any]]:
+        """Return the loaded entries targeted by a service call."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        entries = {
+            key: data
+            for key, data in hass.data.get(DOMAIN, {}).items()
+            if key != NETWORK and (entry_id is None or key == entry_id)
+        }
+        if entry_id is not None and not entries:
+            raise ServiceValidationError(f"Unknown Flux Monitor entry: {entry_id}")
+        return entries
+
+    async def async_get_details(call: ServiceCall) -> ServiceResponse:
+        """Return the app and Parallel Asset lists kept out of the sensor attributes."""
+        node = call.data.get(ATTR_NODE)
+        details = {}
+        for key, data in loaded_entries(call).items():
+            monitor: FluxMonitor = data["monitor"]
+            if node is None:
+                details[key] = monitor.get_details()
+            elif node in monitor.node_ips:
+                details[key] = monitor.get_details([node])
+        if node is not None and not details:
+            raise ServiceValidationError(f"Node not tracked by Flux Monitor: {node}")
+        return {"entries": details}
+
+    async def async_refresh_node(call: ServiceCall) -> ServiceResponse:
+        """Refresh a single node and update only its entities."""
+        node = call.data[ATTR_NODE]
+        nodes = {}
+        for key, data in loaded_entries(call).items():
+            monitor: FluxMonitor = data["monitor"]
+            if node not in monitor.node_ips:
+                continue
+            try:
+                nodes[key] = await monitor.refresh_node(node)
+            except Exception as err:
+                raise HomeAssistantError(f"Error refreshing node {node}: {err}") from err
+            # Seul le node rafraîchi diffère de la vue publiée : les autres
+            # entités ne réécrivent pas leur état
+            data["coordinators"][SOURCE_BENCHMARKS].async_push_data(monitor.build_data())
+        if not nodes:
+            raise ServiceValidationError(f"Node not tracked by Flux Monitor: {node}")
+        return {"entries": nodes}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DETAILS,
+        async_get_details,
+        schema=GET_DETAILS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_NODE,
+        async_refresh_node,
+        schema=REFRESH_NODE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -27,30 +132,99 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     wallet_address = entry.data["wallet_address"]
     node_ips = entry.data.get("node_ips", "").split(",")
     node_ips = [ip.strip() for ip in node_ips if ip.strip()]
+    discovery_addresses = entry.data.get("discovery_addresses", "").split(",")
+    discovery_addresses = [address.strip() for address in discovery_addresses if address.strip()]
+    currencies = entry.data.get("currencies", "").split(",")
+    currencies = [currency.strip().lower() for currency in currencies if currency.strip()]
+
+    await _async_migrate_unique_ids(hass, entry, node_ips)
+
+    network = await _async_acquire_network(hass, entry)
+    client: FluxNetworkClient = network["client"]
 
-    monitor = FluxMonitor(wallet_address, node_ips)
-
-    async def async_update_data():
-        """Fetch data from API."""
-        try:
-            return await monitor.get_all_data()
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=async_update_data,
-        update_interval=SCAN_INTERVAL,
+    monitor = FluxMonitor(
+        wallet_address,
+        node_ips,
+        direct_polling=entry.data.get("direct_polling", False),
+        discover_nodes=entry.data.get("discover_nodes", False),
+        discovery_addresses=discovery_addresses,
+        currencies=currencies,
+        client=client,
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # Les sources du réseau sont rafraîchies par les coordinators partagés ;
+    # ceux de l'entrée ne font que republier leur vue après chaque mise à jour
+    coordinators = {
+        source: FluxSourceCoordinator(
+            hass, monitor, source, None if source in NETWORK_SOURCES else interval
+        )
+        for source, interval in REFRESH_INTERVALS.items()
+    }
+
+    def follow(source: str):
+        @callback
+        def async_publish() -> None:
+            """Publish the entry view after a network source update."""
+            if source == SOURCE_NODES:
+                monitor.discover()
+            old_data = coordinators[source].data
+            data = monitor.build_data()
+            coordinators[source].async_set_updated_data(data)
+            # Un node payé : le wallet est relu sans attendre son propre rythme
+            if source == SOURCE_NODES and old_data and _paid_nodes(old_data, data):
+                monitor.expire_wallet()
+                for wallet_source in (SOURCE_BALANCE, SOURCE_TRANSACTIONS):
+                    hass.async_create_task(coordinators[wallet_source].async_request_refresh())
+
+        return async_publish
+
+    store = FluxSnapshotStore(hass, entry.entry_id)
+
+    async def async_refresh_all() -> None:
+        """Run a full cycle and publish it to every coordinator."""
+        data = await monitor.get_all_data()
+        for coordinator in coordinators.values():
+            coordinator.async_set_updated_data(data)
+        network_data = client.build_data()
+        for source in NETWORK_SOURCES:
+            network["coordinators"][source].async_set_updated_data(network_data)
+
+    # Démarrage à chaud : les entités reprennent le dernier snapshot, marqué
+    # comme périmé, pendant que le cycle complet tourne en arrière-plan, sans
+    # retarder le démarrage de Home Assistant
+    refresh_task: asyncio.Task | None = None
+    if snapshot := await store.async_load():
+        monitor.restore_state(snapshot["state"])
+        stale_data = {**snapshot["data"], "stale": True}
+        for coordinator in coordinators.values():
+            coordinator.async_set_updated_data(stale_data)
+        refresh_task = entry.async_create_background_task(
+            hass, async_refresh_all(), f"{DOMAIN} {entry.entry_id} refresh"
+        )
+    else:
+        # Un premier cycle complet alimente toutes les sources, puis chaque
+        # coordinator suit son propre rythme
+        await async_refresh_all()
+
+    for source in NETWORK_SOURCES:
+        entry.async_on_unload(
+            network["coordinators"][source].async_add_listener(follow(source))
+        )
+
+    @callback
+    def async_schedule_save() -> None:
+        """Persist the snapshots after each data-bearing refresh."""
+        store.async_schedule_save(monitor)
+        network["store"].async_schedule_save(client)
+
+    for source in SNAPSHOT_SOURCES:
+        entry.async_on_unload(coordinators[source].async_add_listener(async_schedule_save))
 
-    hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
-        "coordinator": coordinator,
+        "coordinators": coordinators,
         "monitor": monitor,
+        "store": store,
+        "refresh_task": refresh_task,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -58,11 +232,92 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_acquire_network(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the shared network client, creating it for the first entry."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (network := domain_data.get(NETWORK)) is None:
+        client = FluxNetworkClient()
+        network_coordinators = {
+            source: FluxSourceCoordinator(hass, client, source, REFRESH_INTERVALS[source])
+            for source in NETWORK_SOURCES
+        }
+        network = domain_data[NETWORK] = {
+            "client": client,
+            "coordinators": network_coordinators,
+            "store": FluxNetworkStore(hass),
+            "entries": set(),
+            "unsub_watcher": FluxBlockWatcher(client, network_coordinators).async_start(),
+        }
+        if state := await network["store"].async_load():
+            client.restore_state(state)
+    network["entries"].add(entry.entry_id)
+    return network
+
+
+async def _async_release_network(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Unsubscribe an entry and close the shared client after the last one."""
+    network = hass.data[DOMAIN][NETWORK]
+    network["entries"].discard(entry.entry_id)
+    if not network["entries"]:
+        network["unsub_watcher"]()
+        await network["store"].async_save(network["client"])
+        await network["client"].close()
+        hass.data[DOMAIN].pop(NETWORK)
+
+
+def _paid_nodes(old_data: dict[str, Any], data: dict[str, Any]) -> list[str]:
+    """Return the nodes whose last paid height advanced between two views."""
+    old_nodes = old_data.get("nodes", {})
+    return [
+        node_key
+        for node_key, node in data.get("nodes", {}).items()
+        if node_key in old_nodes
+        and node.get("last_paid_height", 0) > old_nodes[node_key].get("last_paid_height", 0)
+    ]
+
+
+async def _async_migrate_unique_ids(
+    hass: HomeAssistant, entry: ConfigEntry, node_ips: list[str]
+) -> None:
+    """Key node sensors by node IP:port instead of their position in the list."""
+    prefix = f"{entry.entry_id}_node_"
+
+    @callback
+    def migrate(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+        if not entity_entry.unique_id.startswith(prefix):
+            return None
+        idx, _, sensor_key = entity_entry.unique_id[len(prefix):].partition("_")
+        if not idx.isdigit() or not sensor_key or int(idx) >= len(node_ips):
+            return None
+        return {"new_unique_id": f"{prefix}{node_ips[int(idx)]}_{sensor_key}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, migrate)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        # Le cycle de démarrage ne doit plus publier ni rouvrir la session
+        if (refresh_task := hass.data[DOMAIN][entry.entry_id]["refresh_task"]) is not None:
+            refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await refresh_task
         monitor = hass.data[DOMAIN][entry.entry_id]["monitor"]
-        await monitor.close()
+        await hass.data[DOMAIN][entry.entry_id]["store"].async_save(monitor)
         hass.data[DOMAIN].pop(entry.entry_id)
+        # Le snapshot du réseau ne garde que les nodes des moniteurs abonnés :
+        # il est enregistré avant que le dernier moniteur ne se désabonne
+        await _async_release_network(hass, entry)
+        await monitor.close()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted snapshots of a deleted config entry."""
+    await FluxSnapshotStore(hass, entry.entry_id).async_remove()
+    # Le snapshot du réseau est partagé : il part avec la dernière entrée
+    if all(
+        other.entry_id == entry.entry_id for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        await FluxNetworkStore(hass).async_remove()
@@ -0,0 +1,70 @@
+"""
+Statistiques de l'écosystème Flux
+Lues sur les compteurs tenus pendant le décodage des listes du réseau, sans requête ni passe supplémentaire
+"""
+from .network import TIERS
+from .payments import BLOCK_TIME_MINUTES
+
+# Nombre de versions détaillées dans une répartition, les autres sont regroupées
+VERSION_MIX_MAX = 10
+
+
+def _percent(count, total):
+    return round(100 * count / total, 1) if total else None
+
+
+def version_mix(counter):
+    """Part de chaque version (%), les moins répandues regroupées sous "other" """
+    total = sum(counter.values())
+    top = counter.most_common(VERSION_MIX_MAX)
+    mix = {version: _percent(count, total) for version, count in top}
+    other = total - sum(count for _, count in top)
+    if other:
+        mix['other'] = _percent(other, total)
+    return mix
+
+
+def ecosystem_stats(snapshot, payment_queue, benchmark_stats):
+    """
+    Statistiques de l'écosystème à partir des derniers index du réseau
+
+    Les compteurs par tier viennent de la liste des nodes, la longueur des
+    files et l'intervalle entre deux paiements d'un node de la file de
+    paiement (un node payé par tier et par bloc), le reste des compteurs des
+    benchmarks. Une valeur est None tant que sa source n'a pas été téléchargée.
+    """
+    tier_counts = snapshot.tier_counts if snapshot is not None else dict.fromkeys(TIERS, 0)
+    stats = {tier.lower(): count for tier, count in tier_counts.items()}
+    stats['total'] = sum(tier_counts.values())
+
+    for tier in TIERS:
+        length = payment_queue.lengths.get(tier) if payment_queue is not None else None
+        stats[f"queue_length_{tier.lower()}"] = length
+        # Heures entre deux paiements d'un même node
+        stats[f"payout_interval_{tier.lower()}"] = (
+            round(length * BLOCK_TIME_MINUTES / 60, 1) if length else None
+        )
+
+    bench = benchmark_stats
+    if bench is None or not bench.nodes:
+        stats.update(dict.fromkeys((
+            'benchmarked_nodes', 'benchmark_failed', 'benchmark_failed_pct', 'benchmark_statuses',
+            'flux_os_version', 'flux_os_versions', 'benchmark_version', 'benchmark_versions',
+            'apps_total', 'apps_per_node', 'nodes_with_apps_pct',
+        )))
+        return stats
+
+    stats.update({
+        'benchmarked_nodes': bench.benchmarked,
+        'benchmark_failed': bench.failed,
+        'benchmark_failed_pct': _percent(bench.failed, bench.benchmarked),
+        'benchmark_statuses': dict(bench.statuses.most_common(VERSION_MIX_MAX)),
+        'flux_os_version': bench.flux_versions.most_common(1)[0][0] if bench.flux_versions else None,
+        'flux_os_versions': version_mix(bench.flux_versions),
+        'benchmark_version': bench.bench_versions.most_common(1)[0][0] if bench.bench_versions else None,
+        'benchmark_versions': version_mix(bench.bench_versions),
+        'apps_total': bench.apps,
+        'apps_per_node': round(bench.apps / bench.nodes, 2),
+        'nodes_with_apps_pct': _percent(bench.nodes_with_apps, bench.nodes),
+    })
+    return stats
@@ -0,0 +1,122 @@
+"""
+Cache des réponses HTTP de l'API Flux
+TTL par endpoint, revalidation conditionnelle (ETag / Last-Modified) et
+éviction LRU bornée par la taille des réponses ; les index construits au
+décodage, conservés par le client, sont gardés hors de la borne
+"""
+from collections import OrderedDict
+import time
+
+# Taille maximale cumulée des réponses conservées (octets)
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+class CacheEntry:
+    """Réponse décodée et ses validateurs HTTP"""
+    
+    __slots__ = ('data', 'size', 'etag', 'last_modified', 'expires')
+    
+    def __init__(self, data, size, etag, last_modified, expires):
+        self.data = data
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+    
+    def is_fresh(self):
+        """Indique si la réponse peut être servie sans interroger le serveur"""
+        return time.monotonic() < self.expires
+    
+    def conditional_headers(self):
+        """En-têtes de revalidation conditionnelle"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Cache LRU des réponses décodées, indexé par URL
+    
+    Une entrée fraîche est servie directement. Une entrée expirée fournit ses
+    validateurs pour une requête conditionnelle : un 304 prolonge l'entrée
+    sans téléchargement ni décodage.
+    
+    Les entrées épinglées portent des données que l'appelant garde de toute
+    façon (la liste des nodes et les benchmarks du réseau, décodés en index) :
+    elles ne coûtent rien au cache, ne sont pas comptées dans max_bytes et ne
+    sont jamais évincées, quelle que soit la taille de la réponse.
+    """
+    
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._pinned = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+    
+    def get(self, url):
+        """Retourne l'entrée d'une URL (fraîche ou non) et la marque comme récente"""
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+            return entry
+        return self._pinned.get(url)
+    
+    def put(self, url, data, size, ttl, etag=None, last_modified=None, pinned=False):
+        """Enregistre une réponse complète, épinglée si l'appelant garde ses données"""
+        self.discard(url)
+        entry = CacheEntry(data, size, etag, last_modified, time.monotonic() + ttl)
+        if pinned:
+            self._pinned[url] = entry
+            return
+        if size > self.max_bytes:
+            return
+        self._entries[url] = entry
+        self.size += size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+    
+    def revalidated(self, entry, ttl):
+        """Prolonge une entrée confirmée par un 304"""
+        entry.expires = time.monotonic() + ttl
+        self.revalidations += 1
+    
+    def expire(self, prefix):
+        """
+        Marque comme expirées les entrées dont l'URL commence par prefix
+        
+        Elles sont conservées : le prochain appel les revalide par une requête
+        conditionnelle au lieu de les servir.
+        """
+        for entries in (self._entries, self._pinned):
+            for url, entry in entries.items():
+                if url.startswith(prefix):
+                    entry.expires = 0
+    
+    def discard(self, url):
+        """Retire une URL du cache"""
+        self._pinned.pop(url, None)
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.size -= entry.size
+    
+    def stats(self):
+        """Compteurs du cache"""
+        return {
+            'entries': len(self._entries),
+            'size': self.size,
+            'pinned': len(self._pinned),
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': self.evictions,
+        }
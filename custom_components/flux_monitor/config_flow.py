@@ -18,6 +18,10 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required("wallet_address"): str,
         vol.Optional("node_ips", default=""): str,
+        vol.Optional("direct_polling", default=False): bool,
+        vol.Optional("discover_nodes", default=False): bool,
+        vol.Optional("discovery_addresses", default=""): str,
+        vol.Optional("currencies", default=""): str,
     }
 )
 
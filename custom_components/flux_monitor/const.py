@@ -1,3 +1,87 @@
 """Constants for the Flux Monitor integration."""
+from datetime import timedelta
 
 DOMAIN = "flux_monitor"
+
+# Data sources, each refreshed on its own cadence
+SOURCE_BLOCK_HEIGHT = "block_height"
+SOURCE_PRICE = "price"
+SOURCE_NODES = "nodes"
+SOURCE_BENCHMARKS = "benchmarks"
+SOURCE_BALANCE = "balance"
+SOURCE_TRANSACTIONS = "transactions"
+SOURCE_PARALLEL_ASSETS = "parallel_assets"
+
+REFRESH_INTERVALS = {
+    SOURCE_BLOCK_HEIGHT: timedelta(seconds=30),
+    SOURCE_PRICE: timedelta(minutes=1),
+    # Fallback only: the node list is refetched when the chain moves
+    SOURCE_NODES: timedelta(minutes=30),
+    SOURCE_BENCHMARKS: timedelta(minutes=30),
+    SOURCE_BALANCE: timedelta(minutes=5),
+    SOURCE_TRANSACTIONS: timedelta(hours=1),
+    SOURCE_PARALLEL_ASSETS: timedelta(hours=1),
+}
+
+SOURCES = tuple(REFRESH_INTERVALS)
+
+# Wallet-independent sources, refreshed once by the shared network client
+NETWORK_SOURCES = (SOURCE_BLOCK_HEIGHT, SOURCE_PRICE, SOURCE_NODES)
+
+# Sources whose updates schedule a snapshot save; the block height and price
+# change every minute, are refetched right after a restart, and are saved
+# along with the next data-bearing update
+SNAPSHOT_SOURCES = (
+    SOURCE_NODES,
+    SOURCE_BENCHMARKS,
+    SOURCE_BALANCE,
+    SOURCE_TRANSACTIONS,
+    SOURCE_PARALLEL_ASSETS,
+)
+
+# Key of the shared network client in hass.data[DOMAIN]
+NETWORK = "network"
+
+# Block-driven refresh: the node list is refetched every NODE_LIST_REFRESH_BLOCKS
+# new blocks, and on every new block while a tracked node is at most
+# PAYOUT_WATCH_BLOCKS away from its payment; the block height is then polled faster
+NODE_LIST_REFRESH_BLOCKS = 5
+PAYOUT_WATCH_BLOCKS = 2
+BLOCK_HEIGHT_FAST_INTERVAL = timedelta(seconds=10)
+
+# Source each node sensor key is refreshed from
+NODE_SENSOR_SOURCES = {
+    "next_payment": SOURCE_BLOCK_HEIGHT,
+    "blocks_until_payment": SOURCE_BLOCK_HEIGHT,
+    "rank": SOURCE_NODES,
+    "tier": SOURCE_NODES,
+    "ip_port": SOURCE_NODES,
+    "flux_os_version": SOURCE_BENCHMARKS,
+    "benchmark_version": SOURCE_BENCHMARKS,
+    "eps": SOURCE_BENCHMARKS,
+    "dws": SOURCE_BENCHMARKS,
+    "download": SOURCE_BENCHMARKS,
+    "upload": SOURCE_BENCHMARKS,
+    "last_benchmark": SOURCE_BENCHMARKS,
+    "uptime": SOURCE_BENCHMARKS,
+    "score": SOURCE_BENCHMARKS,
+    "apps": SOURCE_BENCHMARKS,
+    "health": SOURCE_BENCHMARKS,
+}
+
+# Source each ecosystem sensor key is refreshed from, when not the node list
+ECOSYSTEM_SENSOR_SOURCES = {
+    "benchmark_failed_pct": SOURCE_BENCHMARKS,
+    "flux_os_version": SOURCE_BENCHMARKS,
+    "benchmark_version": SOURCE_BENCHMARKS,
+    "apps_per_node": SOURCE_BENCHMARKS,
+}
+
+# Source each wallet sensor key is refreshed from
+WALLET_SENSOR_SOURCES = {
+    "balance_flux": SOURCE_BALANCE,
+    "balance_eur": SOURCE_PRICE,
+    "monthly_flux": SOURCE_TRANSACTIONS,
+    "monthly_eur": SOURCE_PRICE,
+    "flux_price_eur": SOURCE_PRICE,
+}
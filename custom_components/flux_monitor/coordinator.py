@@ -0,0 +1,159 @@
+"""Data update coordinators for the Flux Monitor integration."""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .const import (
+    BLOCK_HEIGHT_FAST_INTERVAL,
+    DOMAIN,
+    NODE_LIST_REFRESH_BLOCKS,
+    PAYOUT_WATCH_BLOCKS,
+    REFRESH_INTERVALS,
+    SOURCE_BLOCK_HEIGHT,
+    SOURCE_NODES,
+)
+from .flux_api import FluxMonitor, FluxNetworkClient
+
+_LOGGER = logging.getLogger(__name__)
+
+SECTIONS = ("wallet", "parallel_assets", "ecosystem")
+
+
+class FluxSourceCoordinator(DataUpdateCoordinator):
+    """Refresh a single Flux data source on its own cadence."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        monitor: FluxMonitor | FluxNetworkClient,
+        source: str,
+        update_interval: timedelta | None,
+    ) -> None:
+        """Initialize the coordinator.
+
+        Without an update interval the coordinator only publishes data pushed
+        to it, e.g. when it follows a source of the shared network client.
+        """
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{source}",
+            update_interval=update_interval,
+        )
+        self.monitor = monitor
+        self.source = source
+        # Nodes and sections changed by the last update; None means everything
+        self.changed_nodes: set[str] | None = None
+        self.changed_sections: set[str] | None = None
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch this source and rebuild the data view."""
+        try:
+            data = await self.monitor.refresh_source(self.source)
+        except Exception as err:
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        self._track_changes(data)
+        return data
+
+    @callback
+    def async_set_updated_data(self, data: dict[str, Any]) -> None:
+        """Publish data computed outside of this coordinator."""
+        self._track_changes(data)
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_push_data(self, data: dict[str, Any]) -> None:
+        """Publish data between two refreshes without rescheduling the next one.
+
+        Only the entities whose node or section changed write their state.
+        """
+        self._track_changes(data)
+        self.data = data
+        self.async_update_listeners()
+
+    def _track_changes(self, data: dict[str, Any]) -> None:
+        """Record which nodes and sections differ from the current data."""
+        old = self.data
+        if not old or old.get("stale") != data.get("stale"):
+            self.changed_nodes = None
+            self.changed_sections = None
+            return
+
+        old_nodes = old.get("nodes", {})
+        new_nodes = data.get("nodes", {})
+        self.changed_nodes = {
+            node_key
+            for node_key in old_nodes.keys() | new_nodes.keys()
+            if old_nodes.get(node_key) != new_nodes.get(node_key)
+        }
+        self.changed_sections = {
+            section for section in SECTIONS if old.get(section) != data.get(section)
+        }
+
+    def node_changed(self, node_key: str) -> bool:
+        """Return whether the last update changed a node."""
+        return self.changed_nodes is None or node_key in self.changed_nodes
+
+    def section_changed(self, section: str) -> bool:
+        """Return whether the last update changed a section."""
+        return self.changed_sections is None or section in self.changed_sections
+
+
+class FluxBlockWatcher:
+    """Refetch the node list when the chain moves, not on a fixed timer.
+
+    Only the cheap block height is polled on a short interval. A new block
+    triggers a node list refresh every NODE_LIST_REFRESH_BLOCKS blocks, or on
+    every block while a tracked node is about to be paid, in which case the
+    block height is also polled faster so the payout shows up within seconds.
+    """
+
+    def __init__(
+        self,
+        client: FluxNetworkClient,
+        coordinators: dict[str, FluxSourceCoordinator],
+    ) -> None:
+        """Initialize the watcher."""
+        self.client = client
+        self.coordinators = coordinators
+        self._height = 0
+        self._node_list_height = 0
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Follow the block height coordinator; return the unsubscribe callback."""
+        return self.coordinators[SOURCE_BLOCK_HEIGHT].async_add_listener(self._async_block_update)
+
+    @callback
+    def _async_block_update(self) -> None:
+        """Refresh the node list if the height advanced enough."""
+        height = self.client.block_height
+        if height <= self._height:
+            return
+        first_height = not self._height
+        self._height = height
+
+        due = self.client.blocks_until_next_payment()
+        imminent = due is not None and due <= PAYOUT_WATCH_BLOCKS
+        self.coordinators[SOURCE_BLOCK_HEIGHT].update_interval = (
+            BLOCK_HEIGHT_FAST_INTERVAL if imminent else REFRESH_INTERVALS[SOURCE_BLOCK_HEIGHT]
+        )
+
+        if first_height:
+            # The node list was fetched with the first full refresh
+            self._node_list_height = height
+        elif imminent or height - self._node_list_height >= NODE_LIST_REFRESH_BLOCKS:
+            self._node_list_height = height
+            # The cached list predates the block: revalidate it
+            self.client.expire_node_list()
+            self.coordinators[SOURCE_NODES].hass.async_create_task(
+                self.coordinators[SOURCE_NODES].async_request_refresh()
+            )
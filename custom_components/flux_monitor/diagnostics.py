@@ -0,0 +1,57 @@
+"""Diagnostics support for the Flux Monitor integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .flux_api import COINGECKO_API, EXPLORER_API, FLUXNODES_API
+
+TO_REDACT = {"wallet_address", "node_ips", "discovery_addresses"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    monitor = data["monitor"]
+    coordinators = data["coordinators"]
+
+    # Les coupe-circuits des nodes sont résumés pour ne pas exposer leurs IPs
+    api_hosts = {FLUXNODES_API, EXPLORER_API, COINGECKO_API}
+    breakers = {
+        host: {"failures": breaker.failures, "open": breaker.is_open}
+        for host, breaker in monitor.transport.breakers.items()
+        if host in api_hosts
+    }
+    node_breakers = [
+        breaker for host, breaker in monitor.transport.breakers.items() if host not in api_hosts
+    ]
+    breakers["nodes"] = {
+        "count": len(node_breakers),
+        "open": sum(1 for breaker in node_breakers if breaker.is_open),
+    }
+
+    # Listes de détail hors attributs, sans les IPs des nodes
+    details = monitor.get_details()
+    details["nodes"] = list(details["nodes"].values())
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "metrics": monitor.metrics.as_dict(),
+        "cache": monitor.cache.stats(),
+        "circuit_breakers": breakers,
+        "coordinators": {
+            source: {
+                "last_update_success": coordinator.last_update_success,
+                "update_interval": str(coordinator.update_interval),
+            }
+            for source, coordinator in coordinators.items()
+        },
+        "tracked_nodes": len(monitor.node_ips),
+        "details": details,
+    }
@@ -4,64 +4,943 @@ Monitore les nodes Flux et l'écosystème global
 """
 import aiohttp
 import asyncio
+import contextlib
+import contextvars
 from datetime import datetime, timedelta
+import functools
+import json
 import logging
+import random
+import re
+import time
+
+from .cache import ResponseCache
+from .const import (
+    SOURCE_BALANCE,
+    SOURCE_BENCHMARKS,
+    SOURCE_BLOCK_HEIGHT,
+    SOURCE_NODES,
+    SOURCE_PARALLEL_ASSETS,
+    SOURCE_PRICE,
+    SOURCE_TRANSACTIONS,
+    SOURCES,
+)
+from .analytics import ecosystem_stats
+from .network import (
+    BENCHMARK_PROJECTION,
+    NODE_LIST_PROJECTION,
+    BenchmarkIndex,
+    BenchmarkStats,
+    NodeListSnapshot,
+)
+from .history import FleetHistory
+from .metrics import FluxMetrics
+from .payments import BLOCK_TIME_MINUTES, PaymentQueue
+from .prices import DEFAULT_CURRENCY, PriceHistory
+from .streaming import JsonArrayStream
+from .wallet import WalletTxIndexer
 
 _LOGGER = logging.getLogger(__name__)
 
 # URLs de l'API Flux
 FLUXNODES_API = "https://api.runonflux.io"
 EXPLORER_API = "https://explorer.runonflux.io/api"
+COINGECKO_API = "https://api.coingecko.com/api/v3"
 
-class FluxMonitor:
-    def __init__(self, wallet_address, node_ips=None):
-        """
-        Initialise le moniteur Flux
-        
-        Args:
-            wallet_address: Adresse du wallet Flux
-            node_ips: Liste des IPs des nodes (format ["ip:port", "ip:port"])
-        """
-        self.wallet_address = wallet_address
-        self.node_ips = node_ips or []
+# Cycles de rafraîchissement de la tâche courante : client -> réponses du cycle.
+# Propre à chaque tâche (et copié dans les tâches qu'elle crée) : les sources
+# rafraîchies en parallèle sur un même client ne partagent pas leurs réponses
+_REFRESH_CYCLES = contextvars.ContextVar('flux_refresh_cycles', default={})
+
+# Durée de validité des réponses en cache, par préfixe d'endpoint (secondes)
+ENDPOINT_TTLS = (
+    # Sous l'intervalle rapide du suivi des blocs (10 s)
+    ("/daemon/getblockcount", 5),
+    ("/daemon/viewdeterministiczelnodelist", 120),
+    ("/flux/benchmarks", 900),
+    ("/flux/parallelassets/", 600),
+    ("/addr/", 60),
+    ("/txs", 60),
+    ("/simple/price", 30),
+    ("/coins/", 3600),
+    ("/flux/version", 600),
+    ("/benchmark/", 300),
+)
+DEFAULT_TTL = 30
+
+# Adresse de wallet dans un chemin d'endpoint (retirée des noms des compteurs)
+_ADDRESS_SEGMENT = re.compile(r'/t[13][1-9A-HJ-NP-Za-km-z]{25,}')
+
+# Taille des morceaux lus lors du décodage en flux (octets)
+STREAM_CHUNK_SIZE = 64 * 1024
+# Les morceaux sont regroupés en lots décodés dans un thread de l'executor
+# pendant que le lot suivant est téléchargé (octets)
+DECODE_BATCH_SIZE = 1024 * 1024
+# Taille à partir de laquelle une réponse entière est décodée dans l'executor (octets)
+EXECUTOR_DECODE_MIN_SIZE = 64 * 1024
+
+# Interrogation directe des nodes (API FluxOS de chaque node)
+NODE_DEFAULT_API_PORT = 16127
+NODE_POLL_CONCURRENCY = 10
+NODE_POLL_TIMEOUT = 5
+
+# Délai avant de retenter le téléchargement de l'historique des prix d'une
+# devise après un échec (secondes)
+PRICE_HISTORY_RETRY_DELAY = 900
+
+# Nombre maximum de pages de transactions parcourues par cycle : au-delà,
+# le scan reprend à la page suivante au cycle d'après
+TX_MAX_PAGES = 100
+# Pages de transactions téléchargées en parallèle une fois la première lue
+# (autant que de requêtes simultanées autorisées par hôte)
+TX_PAGE_BATCH = 4
+
+# Nombre maximum d'éléments conservés et retournés pour une liste de détail
+# (applications d'un node, Parallel Assets) : ces listes ne sont jamais
+# publiées dans les attributs des sensors, seulement sur demande
+DETAIL_MAX_ITEMS = 200
+
+# Pool de connexions HTTP
+CONNECTOR_LIMIT = 32
+CONNECTOR_LIMIT_PER_HOST = 8
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+# Requêtes simultanées maximum par hôte
+HOST_CONCURRENCY = 4
+
+# Nouvelles tentatives sur erreur transitoire (backoff exponentiel avec jitter)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+
+# Coupe-circuit : échecs consécutifs avant ouverture, puis pause (secondes)
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 300
+
+
+class TransientError(Exception):
+    """Réponse HTTP qui justifie une nouvelle tentative"""
+    
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """Appel refusé : le coupe-circuit de l'hôte est ouvert"""
+
+
+class CircuitBreaker:
+    """
+    Coupe-circuit d'un hôte
+    
+    Après BREAKER_THRESHOLD échecs consécutifs, les appels vers l'hôte sont
+    suspendus pendant BREAKER_COOLDOWN secondes. Passé ce délai, un seul
+    appel d'essai est autorisé, les autres restant suspendus tant qu'il est
+    en cours : un succès referme le circuit, un échec le rouvre.
+    """
+    
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_until = 0
+        self.probing = False
+    
+    @property
+    def is_open(self):
+        """Indique si les appels sont suspendus (délai en cours ou appel d'essai en vol)"""
+        if self.failures < self.threshold:
+            return False
+        return self.probing or time.monotonic() < self.opened_until
+    
+    def begin_call(self):
+        """Réserve l'appel d'essai si le délai est écoulé ; retourne True pour cet appel"""
+        if self.failures < self.threshold:
+            return False
+        self.probing = True
+        return True
+    
+    def end_call(self, probe):
+        """Libère l'appel d'essai, y compris s'il s'est terminé sans verdict"""
+        if probe:
+            self.probing = False
+    
+    def record_success(self):
+        """Referme le circuit"""
+        self.failures = 0
+        self.opened_until = 0
+    
+    def record_failure(self):
+        """Compte un échec et ouvre le circuit au-delà du seuil"""
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_until = time.monotonic() + self.cooldown
+
+
+class FluxTransport:
+    """
+    Transport HTTP partagé par tous les appels
+    
+    Pool de connexions avec cache DNS et keep-alive, sémaphore par hôte,
+    nouvelles tentatives avec backoff exponentiel et jitter sur les erreurs
+    transitoires, et coupe-circuit par hôte.
+    """
+    
+    def __init__(self):
         self.session = None
-        
-    async def _get_session(self):
+        self._semaphores = {}
+        self.breakers = {}
+        self.retries = 0
+    
+    async def get_session(self):
         """Crée ou retourne la session aiohttp"""
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTOR_LIMIT,
+                limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
         return self.session
     
     async def close(self):
         """Ferme la session"""
         if self.session:
             await self.session.close()
+            self.session = None
+    
+    async def get(self, url, host, handler, headers=None, timeout=30, stats=None):
+        """
+        Effectue un GET et passe la réponse à handler
+        
+        Args:
+            url: URL complète
+            host: Clé de l'hôte (sémaphore et coupe-circuit)
+            handler: Coroutine appelée avec la réponse, dont le résultat est retourné
+            stats: Compteurs de l'endpoint (nouvelles tentatives)
+        
+        Lève CircuitOpenError si l'hôte est suspendu, ou la dernière erreur
+        transitoire une fois les tentatives épuisées.
+        """
+        breaker = self.breakers.setdefault(host, CircuitBreaker())
+        if breaker.is_open:
+            raise CircuitOpenError(host)
+        probe = breaker.begin_call()
+        
+        try:
+            semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(HOST_CONCURRENCY))
+            session = await self.get_session()
             
-    async def _api_call(self, url, endpoint):
-        """Effectue un appel API"""
-        session = await self._get_session()
+            for attempt in range(RETRY_ATTEMPTS):
+                try:
+                    async with semaphore:
+                        async with session.get(url, headers=headers, timeout=timeout) as response:
+                            if response.status in TRANSIENT_STATUSES:
+                                raise TransientError(response.status, _retry_after(response))
+                            result = await handler(response)
+                    breaker.record_success()
+                    return result
+                except (TransientError, asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as err:
+                    if attempt + 1 == RETRY_ATTEMPTS:
+                        breaker.record_failure()
+                        raise
+                    self.retries += 1
+                    if stats is not None:
+                        stats.retries += 1
+                    await asyncio.sleep(_backoff(attempt, getattr(err, 'retry_after', None)))
+        finally:
+            breaker.end_call(probe)
+
+
+def node_api_url(node_ip):
+    """URL de l'API FluxOS d'un node ("ip" ou "ip:port")"""
+    if ':' not in node_ip:
+        node_ip = f"{node_ip}:{NODE_DEFAULT_API_PORT}"
+    return f"http://{node_ip}"
+
+
+def _container_app_name(container):
+    """Nom d'application Flux d'un conteneur Docker ("/fluxcomposant_app" -> "app")"""
+    names = container.get('Names') if isinstance(container, dict) else None
+    name = names[0].lstrip('/') if names else 'unknown'
+    for prefix in ('flux', 'zel'):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    return name.rsplit('_', 1)[-1]
+
+
+def _retry_after(response):
+    """Délai Retry-After en secondes, s'il est numérique"""
+    value = response.headers.get('Retry-After', '')
+    return float(value) if value.isdigit() else None
+
+
+def _backoff(attempt, retry_after=None):
+    """Délai avant la tentative suivante : exponentiel, avec jitter, borné"""
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+    delay = random.uniform(delay / 2, delay)
+    if retry_after:
+        delay = max(delay, min(retry_after, RETRY_MAX_DELAY))
+    return delay
+
+
+class FluxNetworkClient:
+    """
+    Client des données du réseau Flux, indépendantes du wallet
+    
+    Possède la session HTTP, le cache des réponses et l'instrumentation, ainsi
+    que les sources communes à tous les wallets : hauteur de bloc, prix,
+    liste des nodes et benchmarks du réseau. Un seul client est partagé par
+    tous les moniteurs : chaque source n'est téléchargée qu'une fois, quel
+    que soit le nombre de wallets suivis.
+    """
+    
+    def __init__(self):
+        """Initialise le client du réseau"""
+        self.transport = FluxTransport()
+        # Requêtes en cours, partagées entre appelants concurrents (clé = URL)
+        self._inflight = {}
+        # Un seul traitement CPU à la fois dans l'executor : avec le GIL,
+        # chaque thread de décodage supplémentaire retarde d'autant la boucle
+        self._executor_lock = asyncio.Lock()
+        # Dernières valeurs connues des sources du réseau
+        self.node_snapshot = None
+        self.payment_queue = None
+        self.benchmarks = None
+        self.block_height = 0
+        # Prix courant par devise ; flux_price reste le prix en EUR
+        self.flux_prices = {}
+        self.flux_price = 0
+        self.price_history = PriceHistory()
+        # Devise -> instant (monotonic) avant lequel l'historique n'est pas redemandé
+        self._price_history_retry = {}
+        self.cache = ResponseCache()
+        self.metrics = FluxMetrics()
+        # Moniteurs abonnés, un par wallet
+        self.monitors = []
+        
+    async def close(self):
+        """Ferme la session"""
+        await self.transport.close()
+            
+    @contextlib.asynccontextmanager
+    async def refresh_cycle(self):
+        """
+        Délimite un cycle de rafraîchissement
+        
+        Pendant le cycle, chaque URL n'est téléchargée qu'une seule fois : les
+        appels suivants de la même tâche, et des tâches qu'elle lance, sont
+        servis depuis la mémoire. Les cycles imbriqués partagent le cycle le
+        plus externe ; les autres tâches ne voient pas le cycle.
+        """
+        cycles = _REFRESH_CYCLES.get()
+        if self in cycles:
+            yield
+            return
+        token = _REFRESH_CYCLES.set({**cycles, self: {}})
         try:
-            async with session.get(f"{url}{endpoint}", timeout=30) as response:
-                if response.status == 200:
-                    return await response.json()
+            yield
+        finally:
+            _REFRESH_CYCLES.reset(token)
+    
+    async def single_flight(self, key, factory):
+        """
+        Exécute factory() une seule fois par clé
+        
+        Les appelants concurrents qui demandent la même clé attendent la même
+        tâche et partagent son résultat décodé. Dans un cycle de
+        rafraîchissement, le résultat est conservé jusqu'à la fin du cycle.
+        """
+        cycle = _REFRESH_CYCLES.get().get(self)
+        if cycle is not None and key in cycle:
+            return cycle[key]
+        
+        task = self._inflight.get(key)
+        if task is None:
+            async def run():
+                result = await factory()
+                if cycle is not None:
+                    cycle[key] = result
+                return result
+            
+            task = asyncio.ensure_future(run())
+            self._inflight[key] = task
+            
+            def done(finished):
+                if self._inflight.get(key) is finished:
+                    del self._inflight[key]
+            
+            task.add_done_callback(done)
+        
+        # shield : l'annulation d'un appelant n'annule pas la requête partagée
+        return await asyncio.shield(task)
+    
+    async def run_in_executor(self, func, *args):
+        """
+        Exécute un traitement CPU dans l'executor par défaut de la boucle
+        
+        Sous Home Assistant, c'est l'executor de hass : la boucle reste libre
+        pendant le décodage, seul le résultat (déjà projeté) lui revient.
+        """
+        async with self._executor_lock:
+            return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+    
+    async def api_call(self, url, endpoint, timeout=30, projection=None, collector=list, force=False):
+        """
+        Effectue un appel API (dédupliqué, voir single_flight)
+        
+        Avec une projection, la réponse est décodée en flux : seuls les champs
+        projetés des éléments de "data" sont conservés, ajoutés un par un au
+        collecteur qui est retourné à la place du JSON. Avec force, la requête
+        est toujours envoyée, même si le cache contient une réponse fraîche.
+        """
+        key = f"{url}{endpoint}"
+        return await self.single_flight(
+            f"force:{key}" if force else key,
+            lambda: self._fetch(url, endpoint, timeout, projection, collector, force),
+        )
+    
+    @staticmethod
+    def _ttl_for(endpoint):
+        """Durée de validité en cache d'un endpoint"""
+        for prefix, ttl in ENDPOINT_TTLS:
+            if endpoint.startswith(prefix):
+                return ttl
+        return DEFAULT_TTL
+    
+    async def _fetch(self, url, endpoint, timeout=30, projection=None, collector=list, force=False):
+        """
+        Télécharge et décode une réponse JSON, en passant par le cache
+        
+        Une réponse fraîche est servie depuis le cache, sauf avec force ;
+        sinon la requête est conditionnelle et un 304 évite téléchargement et
+        décodage.
+        """
+        full_url = f"{url}{endpoint}"
+        ttl = self._ttl_for(endpoint)
+        stats = self.metrics.endpoint(self._endpoint_name(url, endpoint))
+        entry = self.cache.get(full_url)
+        
+        if entry is not None and entry.is_fresh() and not force:
+            self.cache.hits += 1
+            stats.cache_hits += 1
+            return entry.data
+        
+        headers = entry.conditional_headers() if entry is not None else None
+        
+        async def handle(response):
+            stats.statuses[response.status] += 1
+            if response.status == 304 and entry is not None:
+                self.cache.revalidated(entry, ttl)
+                stats.revalidations += 1
+                return entry.data
+            if response.status == 200:
+                if projection is not None:
+                    data, size = await self._read_projected(response, projection, collector)
+                    if data is None:
+                        stats.errors['incomplete'] += 1
+                        _LOGGER.error(f"Réponse incomplète: {endpoint}")
+                        return None
                 else:
-                    _LOGGER.error(f"Erreur API {response.status}: {endpoint}")
-                    return None
+                    body = await response.read()
+                    size = len(body)
+                    if size >= EXECUTOR_DECODE_MIN_SIZE:
+                        data = await self.run_in_executor(json.loads, body)
+                    else:
+                        data = json.loads(body)
+                stats.bytes += size
+                stats.last_size = size
+                self.cache.misses += 1
+                # Les index projetés sont gardés par le client : leur entrée,
+                # épinglée, ne compte pas dans la borne du cache
+                self.cache.put(
+                    full_url,
+                    data,
+                    size,
+                    ttl,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                    pinned=projection is not None,
+                )
+                return data
+            else:
+                stats.errors[f"HTTP {response.status}"] += 1
+                _LOGGER.error(f"Erreur API {response.status}: {endpoint}")
+                return None
+        
+        start = time.monotonic()
+        attempted = True
+        try:
+            return await self.transport.get(
+                full_url, url, handle, headers=headers, timeout=timeout, stats=stats
+            )
+        except CircuitOpenError:
+            attempted = False
+            stats.errors['circuit_open'] += 1
+            _LOGGER.debug(f"Appel suspendu (coupe-circuit ouvert): {url}")
+            return None
         except Exception as e:
+            stats.errors[str(e) if isinstance(e, TransientError) else type(e).__name__] += 1
             _LOGGER.error(f"Erreur lors de l'appel API {endpoint}: {e}")
             return None
+        finally:
+            if attempted:
+                stats.record_latency(time.monotonic() - start)
+    
+    @staticmethod
+    def _endpoint_name(url, endpoint):
+        """
+        Nom d'un endpoint pour les compteurs
+        
+        Les paramètres de requête et les adresses de wallet sont retirés, et
+        les API de tous les nodes sont regroupées sous "node".
+        """
+        api = {FLUXNODES_API: 'flux', EXPLORER_API: 'explorer', COINGECKO_API: 'coingecko'}.get(url, 'node')
+        path = _ADDRESS_SEGMENT.sub('/*', endpoint.split('?', 1)[0])
+        return f"{api}:{path}"
+    
+    async def _read_projected(self, response, projection, collector):
+        """
+        Décode une réponse par lots en ne gardant que les champs projetés
+        
+        Chaque lot est décodé dans l'executor pendant que le suivant est
+        téléchargé ; les lots sont passés au parseur dans l'ordre, un seul à
+        la fois. La boucle ne fait que recevoir les morceaux.
+        """
+        stream = JsonArrayStream(projection, collector)
+        batch = bytearray()
+        decoding = None
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            batch += chunk
+            if len(batch) >= DECODE_BATCH_SIZE:
+                if decoding is not None:
+                    await decoding
+                decoding = asyncio.ensure_future(self.run_in_executor(stream.feed, bytes(batch)))
+                batch.clear()
+        if decoding is not None:
+            await decoding
+        
+        def finish():
+            stream.feed(bytes(batch))
+            return stream.close()
+        
+        return await self.run_in_executor(finish), stream.size
+    
+    def currencies(self):
+        """Devises suivies par l'ensemble des moniteurs abonnés (EUR toujours en tête)"""
+        return list(dict.fromkeys(
+            [DEFAULT_CURRENCY, *(currency for monitor in self.monitors for currency in monitor.currencies)]
+        ))
     
     async def get_flux_price(self):
-        """Récupère le prix actuel du FLUX en EUR"""
+        """Récupère le prix actuel du FLUX dans toutes les devises suivies, en une requête"""
+        currencies = self.currencies()
+        data = await self.api_call(
+            COINGECKO_API, f"/simple/price?ids=zelcash&vs_currencies={','.join(currencies)}", timeout=10
+        )
+        if not data:
+            return 0
+        prices = data.get('zelcash', {})
+        self.flux_prices.update({currency: prices[currency] for currency in currencies if prices.get(currency)})
+        self.flux_price = self.flux_prices.get(DEFAULT_CURRENCY, self.flux_price)
+        return prices.get(DEFAULT_CURRENCY, 0)
+    
+    async def get_price_history(self):
+        """
+        Complète l'historique des prix journaliers de chaque devise
+        
+        Une seule plage par devise, à partir du premier jour manquant : le
+        premier appel couvre la fenêtre complète, les suivants un jour. Après
+        un échec, la devise n'est pas redemandée avant PRICE_HISTORY_RETRY_DELAY.
+        """
+        async def extend(currency):
+            missing = self.price_history.missing_range(currency)
+            if missing is None or time.monotonic() < self._price_history_retry.get(currency, 0):
+                return
+            start, end = missing
+            data = await self.api_call(
+                COINGECKO_API,
+                f"/coins/zelcash/market_chart/range?vs_currency={currency}&from={start}&to={end}",
+                timeout=10,
+            )
+            if data and data.get('prices'):
+                self.price_history.update(currency, data['prices'])
+                self._price_history_retry.pop(currency, None)
+            else:
+                self._price_history_retry[currency] = time.monotonic() + PRICE_HISTORY_RETRY_DELAY
+        
+        await asyncio.gather(*(extend(currency) for currency in self.currencies()))
+    
+    async def refresh_prices(self):
+        """Rafraîchit le prix courant et l'historique des prix"""
+        await asyncio.gather(self.get_flux_price(), self.get_price_history())
+        return self.flux_price
+    
+    def price_on(self, currency, day):
+        """Prix d'un jour UTC, ou prix courant pour un jour inconnu (jour en cours)"""
+        price = self.price_history.price_on(currency, day)
+        return price if price is not None else self.flux_prices.get(currency, 0)
+    
+    async def get_block_height(self):
+        """Récupère la hauteur de bloc actuelle"""
+        current_height_data = await self.api_call(FLUXNODES_API, "/daemon/getblockcount")
+        current_height = current_height_data.get('data', 0) if current_height_data else 0
+        if current_height:
+            self.block_height = current_height
+        return current_height
+    
+    async def get_benchmarks(self):
+        """Télécharge la liste des benchmarks du réseau (une fois par cycle) et l'indexe"""
+        return await self.single_flight("benchmarks", self._build_benchmarks)
+    
+    async def _build_benchmarks(self):
+        """Construit l'index des benchmarks"""
+        benchmarks = await self.api_call(
+            FLUXNODES_API, "/flux/benchmarks", projection=BENCHMARK_PROJECTION, collector=BenchmarkIndex
+        )
+        
+        # Un 304 ou une réponse encore fraîche renvoie le même index
+        if benchmarks is not None:
+            self.benchmarks = benchmarks
+        return benchmarks
+    
+    async def get_node_snapshot(self):
+        """Télécharge la liste complète des nodes (une fois par cycle) et l'indexe"""
+        return await self.single_flight("node_snapshot", self._build_node_snapshot)
+    
+    async def _build_node_snapshot(self):
+        """Construit l'index en colonnes de la liste des nodes pendant son décodage"""
+        snapshot = await self.api_call(
+            FLUXNODES_API,
+            "/daemon/viewdeterministiczelnodelist",
+            projection=NODE_LIST_PROJECTION,
+            collector=NodeListSnapshot,
+        )
+        
+        # Un 304 ou une réponse encore fraîche renvoie le même index
+        if snapshot is not None:
+            if snapshot is not self.node_snapshot:
+                # Tri de chaque tier : hors de la boucle pour un grand réseau
+                self.payment_queue = await self.run_in_executor(PaymentQueue, snapshot)
+            self.node_snapshot = snapshot
+        return snapshot
+    
+    def build_ecosystem_stats(self):
+        """
+        Construit les statistiques de l'écosystème à partir des derniers index
+        
+        Nodes par tier, files et intervalles de paiement, versions, échecs de
+        benchmark et densité d'applications : tout est lu sur les compteurs
+        tenus pendant le décodage de la liste des nodes et des benchmarks.
+        """
+        return ecosystem_stats(
+            self.node_snapshot,
+            self.payment_queue,
+            self.benchmarks.stats if self.benchmarks is not None else None,
+        )
+    
+    async def refresh(self, source):
+        """Télécharge une source du réseau"""
+        fetchers = {
+            SOURCE_BLOCK_HEIGHT: self.get_block_height,
+            SOURCE_PRICE: self.refresh_prices,
+            SOURCE_NODES: self.get_node_snapshot,
+        }
+        start = time.monotonic()
+        failed = True
         try:
-            session = await self._get_session()
-            async with session.get("https://api.coingecko.com/api/v3/simple/price?ids=zelcash&vs_currencies=eur", timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('zelcash', {}).get('eur', 0)
-        except Exception as e:
-            _LOGGER.error(f"Erreur récupération prix: {e}")
-        return 0
+            await fetchers[source]()
+            failed = False
+        finally:
+            self.metrics.record_refresh(source, time.monotonic() - start, failed)
+    
+    async def refresh_source(self, source):
+        """Rafraîchit une source du réseau et retourne la vue du réseau"""
+        async with self.refresh_cycle():
+            await self.refresh(source)
+        return self.build_data()
+    
+    def build_data(self):
+        """Construit la vue du réseau à partir des dernières données connues"""
+        return {
+            'block_height': self.block_height,
+            'flux_price': self.flux_price,
+            'flux_prices': dict(self.flux_prices),
+            'ecosystem': self.build_ecosystem_stats(),
+            'timestamp': datetime.now().isoformat(),
+        }
+    
+    def tracked_ips(self):
+        """Nodes suivis par l'ensemble des moniteurs abonnés"""
+        return list(dict.fromkeys(node_ip for monitor in self.monitors for node_ip in monitor.node_ips))
+    
+    def expire_node_list(self):
+        """Force la revalidation de la liste des nodes au prochain rafraîchissement"""
+        self.cache.expire(f"{FLUXNODES_API}/daemon/viewdeterministiczelnodelist")
+    
+    def blocks_until_next_payment(self):
+        """
+        Plus petit nombre de blocs avant le paiement d'un node suivi
+        
+        None tant que la file de paiement ou la hauteur de bloc est inconnue.
+        """
+        if self.payment_queue is None or self.node_snapshot is None or not self.block_height:
+            return None
+        blocks = (
+            self.payment_queue.blocks_until_payment(self.node_snapshot.row(node_ip), self.block_height)
+            for node_ip in self.tracked_ips()
+        )
+        return min((count for count in blocks if count is not None), default=None)
+    
+    def export_state(self):
+        """
+        Exporte les dernières données du réseau pour la persistance
+        
+        Les listes du réseau sont réduites aux nodes suivis par les moniteurs.
+        """
+        node_ips = self.tracked_ips()
+        return {
+            'nodes': self.node_snapshot.as_dict(node_ips) if self.node_snapshot else None,
+            'payment_queue': (
+                self.payment_queue.as_dict(self.node_snapshot, node_ips)
+                if self.payment_queue else None
+            ),
+            'benchmarks': self.benchmarks.as_list(node_ips) if self.benchmarks else None,
+            'benchmark_stats': self.benchmarks.stats.as_dict() if self.benchmarks else None,
+            'block_height': self.block_height,
+            'flux_price': self.flux_price,
+            'flux_prices': self.flux_prices,
+            'price_history': self.price_history.as_dict(),
+        }
+    
+    def restore_state(self, state):
+        """
+        Restaure des données exportées par export_state
+        
+        Les données déjà rafraîchies ne sont pas remplacées.
+        """
+        if state.get('nodes') and self.node_snapshot is None:
+            self.node_snapshot = NodeListSnapshot.from_dict(state['nodes'])
+            if state.get('payment_queue'):
+                self.payment_queue = PaymentQueue.from_dict(state['payment_queue'], self.node_snapshot)
+        if state.get('benchmarks') is not None and self.benchmarks is None:
+            self.benchmarks = BenchmarkIndex(state['benchmarks'])
+            # Les compteurs portent sur le réseau complet, pas sur les nodes exportés
+            self.benchmarks.stats = BenchmarkStats.from_dict(state['benchmark_stats'])
+        self.block_height = self.block_height or state.get('block_height', 0)
+        self.flux_price = self.flux_price or state.get('flux_price', 0)
+        self.flux_prices = self.flux_prices or dict(state.get('flux_prices') or {})
+        if state.get('price_history') and not self.price_history.daily:
+            self.price_history.restore(state['price_history'])
+
+
+def _client_attribute(name):
+    """Attribut du moniteur lu sur son client partagé"""
+    return property(lambda self: getattr(self.client, name))
+
+
+class FluxMonitor:
+    def __init__(self, wallet_address, node_ips=None, direct_polling=False,
+                 discover_nodes=False, discovery_addresses=None, currencies=None, client=None):
+        """
+        Initialise le moniteur Flux
+        
+        Args:
+            wallet_address: Adresse du wallet Flux
+            node_ips: Liste des IPs des nodes (format ["ip:port", "ip:port"])
+            direct_polling: Interroger directement l'API FluxOS de chaque node
+            discover_nodes: Suivre aussi tous les nodes payés au wallet
+            discovery_addresses: Adresses de paiement supplémentaires à découvrir
+            currencies: Devises suivies en plus de l'EUR (codes CoinGecko, ex: ["usd"])
+            client: Client des données du réseau partagé (un client propre sinon)
+        """
+        self.wallet_address = wallet_address
+        self.configured_ips = list(node_ips or [])
+        # Nodes suivis : les nodes configurés, puis les nodes découverts
+        self.node_ips = list(self.configured_ips)
+        self.direct_polling = direct_polling
+        self.discover_nodes = discover_nodes
+        self.discovery_addresses = list(dict.fromkeys([wallet_address, *(discovery_addresses or [])]))
+        self.currencies = list(dict.fromkeys([DEFAULT_CURRENCY, *(currency.lower() for currency in currencies or [])]))
+        self.client = client if client is not None else FluxNetworkClient()
+        self._owns_client = client is None
+        self.client.monitors.append(self)
+        # Benchmarks obtenus directement auprès des nodes, par "ip:port"
+        self.node_benchmarks = {}
+        # Dernières valeurs connues des sources propres au wallet
+        self.balance = None
+        self.monthly_flux = None
+        self.parallel_assets = None
+        self.parallel_assets_detail = []
+        self.tx_indexer = WalletTxIndexer(wallet_address)
+        # Historique glissant des benchmarks des nodes suivis
+        self.history = FleetHistory()
+        
+    # Sources du réseau et infrastructure HTTP, tenues par le client partagé
+    transport = _client_attribute('transport')
+    cache = _client_attribute('cache')
+    metrics = _client_attribute('metrics')
+    node_snapshot = _client_attribute('node_snapshot')
+    payment_queue = _client_attribute('payment_queue')
+    benchmarks = _client_attribute('benchmarks')
+    block_height = _client_attribute('block_height')
+    flux_price = _client_attribute('flux_price')
+    flux_prices = _client_attribute('flux_prices')
+    
+    async def close(self):
+        """Se désabonne du client et ferme la session si le client lui est propre"""
+        if self in self.client.monitors:
+            self.client.monitors.remove(self)
+        if self._owns_client:
+            await self.client.close()
+    
+    def refresh_cycle(self):
+        """Délimite un cycle de rafraîchissement (voir FluxNetworkClient.refresh_cycle)"""
+        return self.client.refresh_cycle()
+    
+    async def _api_call(self, url, endpoint, timeout=30, force=False):
+        """Effectue un appel API via le client partagé"""
+        return await self.client.api_call(url, endpoint, timeout, force=force)
+    
+    async def refresh_benchmarks(self):
+        """
+        Rafraîchit les benchmarks des nodes configurés
+        
+        En mode direct, chaque node est interrogé sur sa propre API, la liste
+        centrale servant de repli pour un node qui ne répond pas. La liste
+        centrale est téléchargée dans tous les cas (une fois pour tous les
+        moniteurs, revalidée par le cache) : elle alimente les statistiques de
+        l'écosystème, même sans node configuré.
+        """
+        if self.direct_polling:
+            await asyncio.gather(self.poll_nodes(), self.client.get_benchmarks())
+        else:
+            # Les benchmarks lus par refresh_node cèdent la place à la liste centrale
+            self.node_benchmarks.clear()
+            await self.client.get_benchmarks()
+        self.record_history()
+    
+    def record_history(self, now=None):
+        """Ajoute les derniers benchmarks des nodes suivis à leur historique"""
+        for node_ip in self.node_ips:
+            benchmark = self.benchmark_for(node_ip)
+            if benchmark is not None:
+                self.history.record(node_ip, benchmark, now)
+    
+    def benchmark_for(self, node_ip):
+        """Benchmark d'un node : lu sur le node en mode direct, sinon dans la liste centrale"""
+        benchmark = self.node_benchmarks.get(node_ip)
+        if benchmark is None and self.benchmarks:
+            benchmark = self.benchmarks.get(node_ip)
+        return benchmark
+    
+    async def poll_nodes(self):
+        """
+        Interroge en parallèle l'API FluxOS de chaque node configuré
+        
+        Retourne la liste des nodes qui n'ont pas répondu.
+        """
+        semaphore = asyncio.Semaphore(NODE_POLL_CONCURRENCY)
+        
+        async def poll(node_ip):
+            async with semaphore:
+                return await self.poll_node(node_ip)
+        
+        results = await asyncio.gather(*(poll(node_ip) for node_ip in self.node_ips))
+        
+        missing = []
+        for node_ip, benchmark in zip(self.node_ips, results):
+            if benchmark is None:
+                self.node_benchmarks.pop(node_ip, None)
+                missing.append(node_ip)
+            else:
+                self.node_benchmarks[node_ip] = benchmark
+        return missing
+    
+    async def poll_node(self, node_ip, force=False):
+        """
+        Récupère version, uptime, benchmarks et applications d'un node
+        
+        Le résultat a la même forme qu'une entrée de /flux/benchmarks.
+        Retourne None si le node ne fournit pas ses benchmarks. Avec force,
+        les réponses en cache ne sont pas réutilisées.
+        """
+        base_url = node_api_url(node_ip)
+        
+        async def call(endpoint):
+            data = await self._api_call(base_url, endpoint, timeout=NODE_POLL_TIMEOUT, force=force)
+            if data and data.get('status') == 'success':
+                return data.get('data')
+            return None
+        
+        bench, info, version, uptime, apps = await asyncio.gather(
+            call("/benchmark/getbenchmarks"),
+            call("/benchmark/getinfo"),
+            call("/flux/version"),
+            call("/flux/uptime"),
+            call("/apps/listrunningapps"),
+        )
+        
+        if not isinstance(bench, dict):
+            return None
+        
+        return {
+            'ip': node_ip,
+            'flux': {'version': version or 'N/A'},
+            'bench': {
+                'version': info.get('version', 'N/A') if isinstance(info, dict) else 'N/A',
+                'eps': bench.get('eps', 0),
+                'ddwrite': bench.get('ddwrite', 0),
+                'download': bench.get('download_speed', 0),
+                'upload': bench.get('upload_speed', 0),
+                'time': bench.get('time', 'N/A'),
+                'status': bench.get('status', 'N/A'),
+            },
+            'node': {'uptime': uptime or 0},
+            'apps': [{'name': _container_app_name(container)} for container in apps or []],
+        }
+    
+    async def refresh_node(self, node_ip):
+        """
+        Rafraîchit un seul node suivi, sans cycle complet
+        
+        Le node est interrogé sur sa propre API FluxOS, quel que soit le mode
+        et sans réutiliser les réponses en cache ; s'il ne répond pas, son
+        benchmark est relu dans la liste centrale (servie par le cache tant
+        qu'elle est fraîche). La liste des nodes, la file de paiement et la
+        hauteur de bloc du dernier cycle sont réutilisées.
+        
+        Args:
+            node_ip: IP du node (format "ip:port")
+        
+        Retourne les informations du node, None s'il n'est pas suivi.
+        """
+        if node_ip not in self.node_ips:
+            return None
+        
+        start = time.monotonic()
+        failed = True
+        try:
+            async with self.refresh_cycle():
+                benchmark = await self.poll_node(node_ip, force=True)
+                if benchmark is None:
+                    self.node_benchmarks.pop(node_ip, None)
+                    await self.client.get_benchmarks()
+                else:
+                    self.node_benchmarks[node_ip] = benchmark
+            failed = False
+        finally:
+            self.metrics.record_refresh('node', time.monotonic() - start, failed)
+        
+        benchmark = self.benchmark_for(node_ip)
+        if benchmark is not None:
+            self.history.record(node_ip, benchmark)
+        return self.build_node_info(node_ip)
     
     async def get_node_info(self, node_ip):
         """
@@ -70,50 +949,50 @@ class FluxMonitor:
         Args:
             node_ip: IP du node (format "ip:port")
         """
-        # Informations du node depuis l'API FluxNodes
-        node_data = await self._api_call(FLUXNODES_API, f"/daemon/viewdeterministiczelnodelist?filter={node_ip.split(':')[0]}")
+        await asyncio.gather(self.get_node_snapshot(), self.refresh_benchmarks(), self.client.get_block_height())
         
-        if not node_data or 'data' not in node_data or not node_data['data']:
+        if self.node_snapshot is None:
             _LOGGER.error(f"Impossible de récupérer les données pour {node_ip}")
             return None
         
-        # Prend le premier résultat qui correspond
-        node = None
-        for n in node_data['data']:
-            if node_ip in n.get('ip', ''):
-                node = n
-                break
-        
-        if not node:
+        node_info = self.build_node_info(node_ip)
+        if node_info is None:
             _LOGGER.error(f"Node {node_ip} non trouvé dans la liste")
+        return node_info
+    
+    def build_node_info(self, node_ip):
+        """
+        Construit les informations d'un node à partir des dernières données connues
+        
+        Aucun appel réseau : combine l'index de la liste des nodes, l'index des
+        benchmarks et la hauteur de bloc, chacun rafraîchi à son propre rythme.
+        """
+        if self.node_snapshot is None:
             return None
         
-        # Récupère les benchmarks
-        benchmark_data = await self._api_call(FLUXNODES_API, f"/flux/benchmarks")
-        benchmark = None
-        if benchmark_data and 'data' in benchmark_data:
-            for b in benchmark_data['data']:
-                if b.get('ip', '').startswith(node_ip.split(':')[0]):
-                    benchmark = b
-                    break
+        node = self.node_snapshot.get(node_ip)
+        if not node:
+            return None
         
-        # Calcul du prochain paiement (estimation basée sur le dernier paid height)
-        current_height_data = await self._api_call(FLUXNODES_API, "/daemon/getblockcount")
-        current_height = current_height_data.get('data', 0) if current_height_data else 0
+        benchmark = self.benchmark_for(node_ip)
         
+        # Position dans la file de paiement du tier, avancée d'une place par
+        # bloc miné depuis la liste
         last_paid = node.get('lastpaidheight', 0)
         blocks_until_payment = 0
         next_payment_time = "Inconnu"
+        queue_position = None
         
-        if current_height > 0 and last_paid > 0:
-            # Estimation: un node est payé environ toutes les 2 heures (dépend du nombre de nodes)
-            # Un block = ~2 minutes
-            blocks_until_payment = max(0, 60 - (current_height - last_paid))  # Approximation
-            minutes_until_payment = blocks_until_payment * 2
-            next_payment_time = str(timedelta(minutes=minutes_until_payment))
+        if self.payment_queue is not None:
+            row = self.node_snapshot.row(node_ip)
+            queue_position = self.payment_queue.position(row)
+            if queue_position is not None and self.block_height > 0:
+                blocks_until_payment = self.payment_queue.blocks_until_payment(row, self.block_height)
+                next_payment_time = str(timedelta(minutes=blocks_until_payment * BLOCK_TIME_MINUTES))
         
         # Tier du node
         tier = node.get('tier', 'unknown').upper()
+        queue_length = self.payment_queue.lengths.get(tier) if self.payment_queue else None
         
         # Construction des données
         node_info = {
@@ -122,6 +1001,8 @@ class FluxMonitor:
             'rank': node.get('rank', 'N/A'),
             'next_payment': next_payment_time,
             'blocks_until_payment': blocks_until_payment,
+            'queue_position': queue_position,
+            'queue_length': queue_length,
             'last_paid_height': last_paid,
             'added_height': node.get('addedheight', 0),
             'last_confirmed_height': node.get('lastconfirmedheight', 0),
@@ -142,7 +1023,6 @@ class FluxMonitor:
                 'uptime': benchmark.get('node', {}).get('uptime', 0),
                 'score': benchmark.get('bench', {}).get('status', 'N/A'),
                 'apps': len(benchmark.get('apps', [])),
-                'apps_list': [app.get('name', 'unknown') for app in benchmark.get('apps', [])],
             })
         else:
             node_info.update({
@@ -156,45 +1036,115 @@ class FluxMonitor:
                 'uptime': 0,
                 'score': 'N/A',
                 'apps': 0,
-                'apps_list': [],
             })
         
+        # Statistiques glissantes et dégradations, sans requête au recorder
+        history = self.history.get(node_ip)
+        if history is not None:
+            summary = history.summary()
+            node_info['rolling'] = summary['rolling']
+            node_info['degradations'] = summary['degradations']
+            node_info['health'] = 'degraded' if summary['degradations'] else 'ok'
+        else:
+            node_info['rolling'] = {}
+            node_info['degradations'] = []
+            node_info['health'] = 'unknown'
+        
         return node_info
     
+    async def get_wallet_balance(self):
+        """Récupère la balance du wallet"""
+        balance_data = await self._api_call(EXPLORER_API, f"/addr/{self.wallet_address}/balance")
+        if balance_data is None:
+            return None
+        self.balance = float(balance_data) / 100000000  # Conversion satoshi vers FLUX
+        return self.balance
+    
+    def expire_wallet(self):
+        """Force la revalidation de la balance et des transactions au prochain rafraîchissement"""
+        self.cache.expire(f"{EXPLORER_API}/addr/{self.wallet_address}/")
+        self.cache.expire(f"{EXPLORER_API}/txs?address={self.wallet_address}&")
+    
+    async def get_monthly_rewards(self):
+        """
+        Met à jour les revenus des 30 derniers jours à partir des transactions
+        
+        Seules les pages contenant des transactions inconnues sont
+        téléchargées : la première seule, puis les suivantes par lots de
+        TX_PAGE_BATCH. Le scan n'est intégré qu'une fois allé jusqu'au bout ;
+        à la limite de TX_MAX_PAGES pages, il est suspendu et reprend au
+        cycle suivant là où il s'est arrêté. Les pages décalées par de
+        nouvelles transactions sont relues sans doublon.
+        """
+        indexer = self.tx_indexer
+        pending = dict(indexer.resume_pending)
+        page = indexer.resume_page
+        last_page = page + TX_MAX_PAGES
+        pages_total = None
+        done = False
+        
+        while not done and page < last_page:
+            if pages_total is None:
+                batch = [page]
+            else:
+                batch = range(page, min(page + TX_PAGE_BATCH, pages_total, last_page))
+            results = await asyncio.gather(*(
+                self._api_call(EXPLORER_API, f"/txs?address={self.wallet_address}&pageNum={num}")
+                for num in batch
+            ))
+            
+            for tx_data in results:
+                if not tx_data or 'txs' not in tx_data:
+                    return None
+                
+                page += 1
+                pages_total = tx_data.get('pagesTotal', 0)
+                if indexer.scan_page(tx_data['txs'], pending) or page >= pages_total:
+                    done = True
+                    break
+        
+        if not done:
+            indexer.suspend(pending, page)
+            return self.monthly_flux
+        
+        indexer.apply(pending)
+        self.monthly_flux = indexer.total
+        return self.monthly_flux
+    
     async def get_wallet_info(self):
         """Récupère les informations du wallet"""
-        # Balance du wallet
-        balance_data = await self._api_call(EXPLORER_API, f"/addr/{self.wallet_address}/balance")
-        balance = float(balance_data) / 100000000 if balance_data else 0  # Conversion satoshi vers FLUX
-        
-        # Prix du FLUX
-        flux_price = await self.get_flux_price()
-        balance_eur = balance * flux_price
-        
-        # Récupère les transactions pour calculer les revenus mensuels
-        # On prend les 1000 dernières transactions
-        tx_data = await self._api_call(EXPLORER_API, f"/txs?address={self.wallet_address}&pageNum=0")
-        
-        monthly_flux = 0
-        if tx_data and 'txs' in tx_data:
-            # Calcule les revenus des 30 derniers jours
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            for tx in tx_data['txs']:
-                tx_time = datetime.fromtimestamp(tx.get('blocktime', 0))
-                if tx_time >= thirty_days_ago:
-                    # Calcule le montant reçu
-                    for vout in tx.get('vout', []):
-                        if self.wallet_address in vout.get('scriptPubKey', {}).get('addresses', []):
-                            monthly_flux += float(vout.get('value', 0))
-        
-        monthly_eur = monthly_flux * flux_price
+        await asyncio.gather(self.get_wallet_balance(), self.client.refresh_prices(), self.get_monthly_rewards())
+        return self.build_wallet_info()
+    
+    def build_wallet_info(self):
+        """
+        Construit les informations du wallet à partir des dernières données connues
+        
+        Les revenus du mois sont valorisés au prix du jour de chaque paiement
+        (prix courant pour les paiements du jour) ; la balance au prix courant.
+        """
+        balance = self.balance or 0
+        monthly_flux = self.monthly_flux or 0
+        flux_price = self.flux_price
+        
+        fiat = {}
+        for currency in self.currencies:
+            price = self.flux_prices.get(currency, 0)
+            fiat[currency] = {
+                'price': price,
+                'balance': balance * price,
+                'monthly': self.tx_indexer.value(
+                    lambda day, currency=currency: self.client.price_on(currency, day)
+                ),
+            }
         
         return {
             'balance_flux': balance,
-            'balance_eur': balance_eur,
+            'balance_eur': balance * flux_price,
             'monthly_flux': monthly_flux,
-            'monthly_eur': monthly_eur,
+            'monthly_eur': fiat[DEFAULT_CURRENCY]['monthly'],
             'flux_price_eur': flux_price,
+            'fiat': fiat,
         }
     
     async def get_parallel_assets(self):
@@ -207,71 +1157,180 @@ class FluxMonitor:
             assets = pa_data['data']
             total_value = sum(asset.get('amount', 0) for asset in assets)
             
-            return {
+            self.parallel_assets = {
                 'total_assets': len(assets),
                 'total_value': total_value,
-                'assets_detail': assets,
             }
+            # Le détail n'est servi que sur demande (voir get_details)
+            self.parallel_assets_detail = assets[:DETAIL_MAX_ITEMS]
+            return self.parallel_assets
         
         return {
             'total_assets': 0,
             'total_value': 0,
-            'assets_detail': [],
         }
     
-    async def get_ecosystem_stats(self):
-        """Récupère les statistiques globales de l'écosystème Flux"""
-        nodes_data = await self._api_call(FLUXNODES_API, "/daemon/viewdeterministiczelnodelist")
-        
-        if not nodes_data or 'data' not in nodes_data:
-            return {
-                'cumulus': 0,
-                'nimbus': 0,
-                'stratus': 0,
-                'total': 0,
-            }
+    def get_details(self, node_ips=None):
+        """
+        Listes de détail, lues en mémoire sans appel réseau
         
-        cumulus = sum(1 for node in nodes_data['data'] if node.get('tier') == 'CUMULUS')
-        nimbus = sum(1 for node in nodes_data['data'] if node.get('tier') == 'NIMBUS')
-        stratus = sum(1 for node in nodes_data['data'] if node.get('tier') == 'STRATUS')
+        Applications de chaque node suivi (ou des seuls nodes demandés) et
+        Parallel Assets du wallet, tronquées à DETAIL_MAX_ITEMS éléments ;
+        les totaux indiquent la taille réelle des listes.
+        """
+        nodes = {}
+        for node_ip in node_ips if node_ips is not None else self.node_ips:
+            benchmark = self.benchmark_for(node_ip)
+            apps = [app.get('name', 'unknown') for app in (benchmark or {}).get('apps', [])]
+            nodes[node_ip] = {'apps': apps[:DETAIL_MAX_ITEMS], 'apps_total': len(apps)}
         
         return {
-            'cumulus': cumulus,
-            'nimbus': nimbus,
-            'stratus': stratus,
-            'total': cumulus + nimbus + stratus,
+            'nodes': nodes,
+            'parallel_assets': {
+                'assets': self.parallel_assets_detail,
+                'total': (self.parallel_assets or {}).get('total_assets', 0),
+            },
         }
     
-    async def get_all_data(self):
-        """Récupère toutes les données en parallèle"""
-        tasks = []
-        
-        # Nodes individuels
-        nodes_data = []
-        for node_ip in self.node_ips:
-            tasks.append(self.get_node_info(node_ip))
+    async def get_node_snapshot(self):
+        """Récupère la liste des nodes du réseau et met à jour les nodes suivis"""
+        snapshot = await self.client.get_node_snapshot()
+        self.discover()
+        return snapshot
+    
+    def discover(self):
+        """
+        Met à jour les nodes suivis avec ceux payés aux adresses surveillées
         
-        # Wallet info
-        tasks.append(self.get_wallet_info())
+        Une recherche dans l'index par adresse de paiement de la liste déjà
+        téléchargée : aucune requête par node. Les nodes configurés gardent
+        leur place en tête de liste.
+        """
+        if not self.discover_nodes or self.node_snapshot is None:
+            return
         
-        # Parallel Assets
-        tasks.append(self.get_parallel_assets())
+        snapshot = self.node_snapshot
+        configured_rows = {snapshot.row(node_ip) for node_ip in self.configured_ips}
+        discovered = [
+            snapshot.ips[row]
+            for address in self.discovery_addresses
+            for row in snapshot.rows_for_address(address)
+            if row not in configured_rows
+        ]
+        node_ips = self.configured_ips + list(dict.fromkeys(discovered))
         
-        # Ecosystem stats
-        tasks.append(self.get_ecosystem_stats())
+        if node_ips != self.node_ips:
+            _LOGGER.debug(f"{len(node_ips) - len(self.configured_ips)} nodes découverts")
+            self.node_ips = node_ips
+            self.history.retain(node_ips)
+            tracked = set(node_ips)
+            self.node_benchmarks = {
+                node_ip: benchmark
+                for node_ip, benchmark in self.node_benchmarks.items()
+                if node_ip in tracked
+            }
+    
+    async def get_ecosystem_stats(self):
+        """Récupère les statistiques globales de l'écosystème Flux"""
+        await self.get_node_snapshot()
+        return self.build_ecosystem_stats()
+    
+    def build_ecosystem_stats(self):
+        """Construit les statistiques de l'écosystème à partir du dernier index"""
+        return self.client.build_ecosystem_stats()
+    
+    async def _refresh(self, source):
+        """Télécharge une seule source de données"""
+        fetchers = {
+            SOURCE_BLOCK_HEIGHT: self.client.get_block_height,
+            SOURCE_PRICE: self.client.refresh_prices,
+            SOURCE_NODES: self.get_node_snapshot,
+            SOURCE_BENCHMARKS: self.refresh_benchmarks,
+            SOURCE_BALANCE: self.get_wallet_balance,
+            SOURCE_TRANSACTIONS: self.get_monthly_rewards,
+            SOURCE_PARALLEL_ASSETS: self.get_parallel_assets,
+        }
+        start = time.monotonic()
+        failed = True
+        try:
+            await fetchers[source]()
+            failed = False
+        finally:
+            self.metrics.record_refresh(source, time.monotonic() - start, failed)
+    
+    async def refresh_source(self, source):
+        """
+        Rafraîchit une seule source de données et retourne la vue complète
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Les autres sources ne sont pas re-téléchargées : leurs dernières
+        valeurs connues sont réutilisées pour construire la vue.
+        """
+        async with self.refresh_cycle():
+            await self._refresh(source)
+        return self.build_data()
+    
+    def build_data(self):
+        """
+        Construit la vue complète à partir des dernières données connues
         
-        # Sépare les résultats
-        nodes_data = results[:len(self.node_ips)]
-        wallet_info = results[len(self.node_ips)]
-        parallel_assets = results[len(self.node_ips) + 1]
-        ecosystem_stats = results[len(self.node_ips) + 2]
+        Les nodes sont indexés par leur IP:port configurée : un node absent de
+        la liste du réseau ne décale pas les autres.
+        """
+        nodes_data = {node_ip: self.build_node_info(node_ip) for node_ip in self.node_ips}
         
         return {
-            'nodes': [n for n in nodes_data if n is not None and not isinstance(n, Exception)],
-            'wallet': wallet_info if not isinstance(wallet_info, Exception) else {},
-            'parallel_assets': parallel_assets if not isinstance(parallel_assets, Exception) else {},
-            'ecosystem': ecosystem_stats if not isinstance(ecosystem_stats, Exception) else {},
+            'nodes': {node_ip: n for node_ip, n in nodes_data.items() if n is not None},
+            'wallet': self.build_wallet_info(),
+            'parallel_assets': self.parallel_assets or {},
+            'ecosystem': self.build_ecosystem_stats(),
             'timestamp': datetime.now().isoformat(),
         }
+    
+    def export_state(self):
+        """
+        Exporte les dernières données du wallet pour la persistance
+        
+        Les données du réseau sont exportées par le client partagé.
+        """
+        return {
+            'node_benchmarks': self.node_benchmarks,
+            'balance': self.balance,
+            'monthly_flux': self.monthly_flux,
+            'parallel_assets': self.parallel_assets,
+            'parallel_assets_detail': self.parallel_assets_detail,
+            'tx_indexer': self.tx_indexer.as_dict(),
+            'history': self.history.as_dict(),
+        }
+    
+    def restore_state(self, state):
+        """Restaure des données exportées par export_state"""
+        self.discover()
+        self.node_benchmarks = dict(state.get('node_benchmarks') or {})
+        self.balance = state.get('balance')
+        self.monthly_flux = state.get('monthly_flux')
+        self.parallel_assets = state.get('parallel_assets')
+        self.parallel_assets_detail = list(state.get('parallel_assets_detail') or [])
+        if state.get('tx_indexer'):
+            self.tx_indexer.restore(state['tx_indexer'])
+        if state.get('history'):
+            self.history.restore(state['history'])
+            self.history.retain(self.node_ips)
+    
+    async def get_all_data(self):
+        """Récupère toutes les données en parallèle"""
+        start = time.monotonic()
+        async with self.refresh_cycle():
+            await asyncio.gather(
+                *(self._refresh(source) for source in SOURCES),
+                return_exceptions=True,
+            )
+        self.metrics.record_refresh('all', time.monotonic() - start)
+        
+        # Signale les nodes configurés absents de la liste du réseau
+        if self.node_snapshot is not None:
+            for node_ip in self.configured_ips:
+                if self.node_snapshot.get(node_ip) is None:
+                    _LOGGER.error(f"Node {node_ip} non trouvé dans la liste")
+        
+        _LOGGER.debug(f"Cache HTTP: {self.cache.stats()}")
+        return self.build_data()
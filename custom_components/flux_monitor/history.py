@@ -0,0 +1,257 @@
+"""
+Historique glissant des métriques des nodes Flux
+Tampons circulaires de taille fixe, à plusieurs résolutions, persistés avec le snapshot
+"""
+from array import array
+import math
+import time
+
+# Métriques de benchmark historisées pour chaque node
+HISTORY_METRICS = ('eps', 'dws', 'download', 'upload', 'uptime', 'status')
+
+# Résolutions : (nom, durée d'un créneau en secondes, nombre de créneaux)
+HISTORY_RESOLUTIONS = (
+    ('48h', 3600, 48),
+    ('90d', 86400, 90),
+)
+
+# Rang du statut de benchmark : un rang plus bas est une dégradation
+STATUS_RANKS = {'CUMULUS': 1, 'NIMBUS': 2, 'STRATUS': 3}
+
+# Chute (fraction de la moyenne sur 90 jours) signalée comme dégradation
+DEGRADATION_METRICS = ('eps', 'dws')
+DEGRADATION_DROP = 0.2
+# Créneaux journaliers nécessaires avant de comparer à la moyenne
+DEGRADATION_MIN_DAYS = 3
+
+
+class RingBuffer:
+    """
+    Moyennes d'une métrique par créneau de temps, sur une fenêtre glissante
+
+    Le créneau d'un échantillon est son timestamp divisé par la durée d'un
+    créneau ; sa valeur est rangée à l'index créneau % capacité. Les créneaux
+    sans échantillon valent NaN, si bien que la fenêtre couvre toujours la même
+    durée, quels que soient les trous dans les mesures.
+    """
+
+    __slots__ = ('period', 'values', 'last_slot', '_count')
+
+    def __init__(self, period, capacity):
+        self.period = period
+        self.values = array('d', [math.nan]) * capacity
+        self.last_slot = None
+        # Nombre d'échantillons moyennés dans le dernier créneau
+        self._count = 0
+
+    def _advance(self, slot):
+        """Vide les créneaux sortis de la fenêtre jusqu'au créneau donné"""
+        if self.last_slot is None or slot <= self.last_slot:
+            return
+        capacity = len(self.values)
+        for skipped in range(self.last_slot + 1, min(slot, self.last_slot + capacity) + 1):
+            self.values[skipped % capacity] = math.nan
+        self.last_slot = slot
+        self._count = 0
+
+    def add(self, timestamp, value):
+        """Ajoute un échantillon à la moyenne de son créneau"""
+        slot = int(timestamp // self.period)
+        if self.last_slot is None:
+            self.last_slot = slot
+        elif slot < self.last_slot:
+            # Échantillon antérieur au dernier créneau : ignoré
+            return
+        self._advance(slot)
+
+        index = slot % len(self.values)
+        if self._count == 0:
+            self.values[index] = value
+        else:
+            self.values[index] += (value - self.values[index]) / (self._count + 1)
+        self._count += 1
+
+    def window(self, now=None):
+        """Valeurs des créneaux de la fenêtre, du plus ancien au plus récent"""
+        if self.last_slot is None:
+            return []
+        self._advance(int((now if now is not None else time.time()) // self.period))
+        capacity = len(self.values)
+        start = self.last_slot + 1
+        values = (self.values[(start + offset) % capacity] for offset in range(capacity))
+        return [value for value in values if not math.isnan(value)]
+
+    def as_dict(self):
+        """Exporte le tampon pour la persistance (NaN exporté en None)"""
+        return {
+            'last_slot': self.last_slot,
+            'count': self._count,
+            'values': [None if math.isnan(value) else value for value in self.values],
+        }
+
+    def restore(self, data):
+        """Restaure un tampon exporté par as_dict, si sa capacité n'a pas changé"""
+        if len(data['values']) != len(self.values):
+            return
+        self.values = array('d', (math.nan if value is None else value for value in data['values']))
+        self.last_slot = data['last_slot']
+        self._count = data['count']
+
+
+def rolling_stats(values):
+    """Minimum, moyenne et p95 (rang le plus proche) d'une fenêtre"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    return {
+        'min': ordered[0],
+        'mean': sum(ordered) / len(ordered),
+        'p95': p95,
+    }
+
+
+class NodeHistory:
+    """Tampons de toutes les métriques d'un node, à chaque résolution"""
+
+    def __init__(self):
+        self.buffers = {
+            metric: {name: RingBuffer(period, capacity) for name, period, capacity in HISTORY_RESOLUTIONS}
+            for metric in HISTORY_METRICS
+        }
+        self.latest = {}
+        # Résumé calculé, valable jusqu'au prochain échantillon ou créneau
+        self._summary = None
+        self._summary_key = None
+
+    def record(self, values, timestamp):
+        """Ajoute un échantillon de chaque métrique présente"""
+        for metric, value in values.items():
+            if value is None or metric not in self.buffers:
+                continue
+            self.latest[metric] = value
+            for buffer in self.buffers[metric].values():
+                buffer.add(timestamp, value)
+        self._summary = None
+
+    def stats(self, metric, now=None):
+        """Statistiques glissantes d'une métrique, par résolution"""
+        return {
+            name: rolling_stats(buffer.window(now))
+            for name, buffer in self.buffers[metric].items()
+        }
+
+    def degradations(self, now=None):
+        """
+        Liste les dégradations en cours
+
+        - status_drop : le statut de benchmark est sous le meilleur statut des
+          48 dernières heures ;
+        - <métrique>_drop : la dernière mesure est inférieure de plus de
+          DEGRADATION_DROP à la moyenne des 90 derniers jours.
+        """
+        reasons = []
+        status = self.latest.get('status')
+        if status is not None:
+            best = max(self.buffers['status']['48h'].window(now), default=status)
+            if status < best:
+                reasons.append('status_drop')
+
+        for metric in DEGRADATION_METRICS:
+            value = self.latest.get(metric)
+            daily = self.buffers[metric]['90d'].window(now)
+            if value is None or len(daily) < DEGRADATION_MIN_DAYS:
+                continue
+            baseline = sum(daily) / len(daily)
+            if baseline > 0 and value < baseline * (1 - DEGRADATION_DROP):
+                reasons.append(f"{metric}_drop")
+        return reasons
+
+    def summary(self, now=None):
+        """
+        Statistiques glissantes de chaque métrique et dégradations en cours
+
+        Le résultat est réutilisé tant qu'aucun échantillon n'est ajouté et
+        que le créneau le plus fin n'a pas changé : la vue des données est
+        reconstruite bien plus souvent que les benchmarks ne changent.
+        """
+        now = now if now is not None else time.time()
+        key = int(now // HISTORY_RESOLUTIONS[0][1])
+        if self._summary is None or self._summary_key != key:
+            self._summary = {
+                'rolling': {metric: self.stats(metric, now) for metric in HISTORY_METRICS if metric != 'status'},
+                'degradations': self.degradations(now),
+            }
+            self._summary_key = key
+        return self._summary
+
+    def as_dict(self):
+        """Exporte l'historique pour la persistance"""
+        return {
+            'latest': self.latest,
+            'buffers': {
+                metric: {name: buffer.as_dict() for name, buffer in buffers.items()}
+                for metric, buffers in self.buffers.items()
+            },
+        }
+
+    def restore(self, data):
+        """Restaure un historique exporté par as_dict"""
+        self.latest = dict(data.get('latest') or {})
+        self._summary = None
+        for metric, buffers in (data.get('buffers') or {}).items():
+            for name, buffer_data in buffers.items():
+                buffer = self.buffers.get(metric, {}).get(name)
+                if buffer is not None:
+                    buffer.restore(buffer_data)
+
+
+def benchmark_sample(benchmark):
+    """Valeurs historisées d'une entrée de benchmark (format /flux/benchmarks)"""
+    bench = benchmark.get('bench', {})
+    status = bench.get('status')
+    return {
+        'eps': _number(bench.get('eps')),
+        'dws': _number(bench.get('ddwrite')),
+        'download': _number(bench.get('download')),
+        'upload': _number(bench.get('upload')),
+        'uptime': _number(benchmark.get('node', {}).get('uptime')),
+        'status': STATUS_RANKS.get(str(status).upper(), 0) if status is not None else None,
+    }
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class FleetHistory:
+    """Historique des nodes suivis, par "ip:port" """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def record(self, node_ip, benchmark, timestamp=None):
+        """Ajoute l'échantillon d'un node à partir de son entrée de benchmark"""
+        history = self.nodes.get(node_ip)
+        if history is None:
+            history = self.nodes[node_ip] = NodeHistory()
+        history.record(benchmark_sample(benchmark), timestamp if timestamp is not None else time.time())
+
+    def get(self, node_ip):
+        return self.nodes.get(node_ip)
+
+    def retain(self, node_ips):
+        """Oublie l'historique des nodes qui ne sont plus suivis"""
+        tracked = set(node_ips)
+        self.nodes = {node_ip: history for node_ip, history in self.nodes.items() if node_ip in tracked}
+
+    def as_dict(self):
+        return {node_ip: history.as_dict() for node_ip, history in self.nodes.items()}
+
+    def restore(self, data):
+        for node_ip, history_data in data.items():
+            history = self.nodes[node_ip] = NodeHistory()
+            history.restore(history_data)
@@ -0,0 +1,135 @@
+"""
+Instrumentation des appels API Flux
+Compteurs par endpoint et par source, assez légers pour rester actifs en production
+"""
+from collections import Counter
+
+# Bornes supérieures des classes de l'histogramme des latences (secondes)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class EndpointStats:
+    """
+    Compteurs d'un endpoint
+
+    La latence couvre l'attente du sémaphore de l'hôte et les nouvelles
+    tentatives : c'est le temps vu par l'appelant.
+    """
+
+    __slots__ = (
+        'requests', 'errors', 'statuses', 'retries', 'cache_hits', 'revalidations',
+        'bytes', 'last_size', 'latency_buckets', 'latency_sum', 'latency_max',
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = Counter()
+        self.statuses = Counter()
+        self.retries = 0
+        self.cache_hits = 0
+        self.revalidations = 0
+        self.bytes = 0
+        self.last_size = 0
+        # Une classe par borne, plus une pour les latences au-delà
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+
+    def record_latency(self, seconds):
+        """Ajoute la durée d'une requête à l'histogramme"""
+        self.requests += 1
+        self.latency_sum += seconds
+        if seconds > self.latency_max:
+            self.latency_max = seconds
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.latency_buckets[index] += 1
+                return
+        self.latency_buckets[-1] += 1
+
+    def latency_quantile(self, quantile):
+        """Borne supérieure de la classe contenant le quantile (secondes)"""
+        if not self.requests:
+            return None
+        rank = quantile * self.requests
+        seen = 0
+        for index, count in enumerate(self.latency_buckets[:-1]):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS[index]
+        return self.latency_max
+
+    def as_dict(self):
+        """Exporte les compteurs"""
+        return {
+            'requests': self.requests,
+            'errors': dict(self.errors),
+            'statuses': {str(status): count for status, count in self.statuses.items()},
+            'retries': self.retries,
+            'cache_hits': self.cache_hits,
+            'revalidations': self.revalidations,
+            'bytes': self.bytes,
+            'last_size': self.last_size,
+            'latency_histogram': dict(zip(
+                [str(bound) for bound in LATENCY_BUCKETS] + ['+Inf'], self.latency_buckets
+            )),
+            'latency_mean': self.latency_sum / self.requests if self.requests else None,
+            'latency_p95': self.latency_quantile(0.95),
+            'latency_max': self.latency_max,
+        }
+
+
+class FluxMetrics:
+    """Compteurs de tous les endpoints et durées des rafraîchissements par source"""
+
+    def __init__(self):
+        self.endpoints = {}
+        # Source -> durée du dernier rafraîchissement (secondes)
+        self.refresh_durations = {}
+        self.refresh_counts = Counter()
+        self.refresh_failures = Counter()
+
+    def endpoint(self, name):
+        """Retourne (en le créant au besoin) les compteurs d'un endpoint"""
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def record_refresh(self, source, seconds, failed=False):
+        """Enregistre la durée d'un rafraîchissement"""
+        self.refresh_durations[source] = seconds
+        self.refresh_counts[source] += 1
+        if failed:
+            self.refresh_failures[source] += 1
+
+    @property
+    def requests(self):
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    @property
+    def errors(self):
+        return sum(sum(stats.errors.values()) for stats in self.endpoints.values())
+
+    @property
+    def retries(self):
+        return sum(stats.retries for stats in self.endpoints.values())
+
+    @property
+    def cache_hits(self):
+        return sum(stats.cache_hits for stats in self.endpoints.values())
+
+    def latency_p95(self):
+        """Pire p95 parmi les endpoints (secondes)"""
+        quantiles = [stats.latency_quantile(0.95) for stats in self.endpoints.values()]
+        quantiles = [quantile for quantile in quantiles if quantile is not None]
+        return max(quantiles) if quantiles else None
+
+    def as_dict(self):
+        """Exporte tous les compteurs"""
+        return {
+            'endpoints': {name: stats.as_dict() for name, stats in sorted(self.endpoints.items())},
+            'refresh_durations': dict(self.refresh_durations),
+            'refresh_counts': dict(self.refresh_counts),
+            'refresh_failures': dict(self.refresh_failures),
+        }
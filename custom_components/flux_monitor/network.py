@@ -0,0 +1,346 @@
+"""
+Index de la liste déterministe des nodes Flux
+Construit une seule fois par cycle à partir de la liste complète du réseau
+"""
+
+from array import array
+from collections import Counter
+
+TIERS = ("CUMULUS", "NIMBUS", "STRATUS")
+# Codage des tiers sur un petit entier ; -1 pour un tier inconnu
+TIER_CODES = {tier: code for code, tier in enumerate(TIERS)}
+UNKNOWN_TIER = -1
+
+_COLLATERAL_PREFIX = 'COutPoint('
+
+
+def _host(ip):
+    """Retourne l'IP sans le port"""
+    return ip.split(':')[0]
+
+
+def _int(value):
+    """Valeur entière d'une colonne, -1 si absente"""
+    return value if isinstance(value, int) else -1
+
+
+def _collateral_output(collateral, txhash):
+    """Index de sortie d'un collateral "COutPoint(txhash, n)", -1 si autre format"""
+    prefix = f"{_COLLATERAL_PREFIX}{txhash}, "
+    if txhash and collateral.startswith(prefix) and collateral.endswith(')'):
+        output = collateral[len(prefix):-1]
+        if output.isdigit():
+            return int(output)
+    return -1
+
+
+class NodeListSnapshot:
+    """
+    Liste des nodes du réseau stockée en colonnes
+    
+    Une ligne par node : le tier est codé sur un octet, les hauteurs et le
+    rank dans des tableaux d'entiers 32 bits (-1 si absent), les chaînes
+    dans des listes ; le collateral n'est gardé que sous forme d'index de
+    sortie de la transaction. Les index (par "ip:port", par tier et par
+    adresse de paiement) pointent vers des numéros de ligne et sont
+    construits pendant la même passe que les compteurs par tier.
+    
+    Le snapshot sert aussi de collecteur au décodage en flux : chaque node
+    projeté est ajouté par append() dès qu'il est lu.
+    """
+    
+    def __init__(self, nodes=()):
+        self.ips = []
+        self.tiers = array('b')
+        self.ranks = array('i')
+        self.last_paid = array('i')
+        self.confirmed = array('i')
+        self.last_confirmed = array('i')
+        self.added = array('i')
+        self.addresses = []
+        self.txhashes = []
+        # Index de sortie du collateral "COutPoint(txhash, n)", reconstruit à la demande
+        self.collateral_outputs = array('i')
+        # Collaterals qui ne suivent pas ce format, par ligne
+        self.collateral_overrides = {}
+        
+        self.by_ip = {}
+        self._by_host = None
+        self.rows_by_tier = {code: array('i') for code in TIER_CODES.values()}
+        # adresse -> ligne, ou liste de lignes si plusieurs nodes partagent l'adresse
+        self.by_address = {}
+        self.tier_totals = [0] * len(TIERS)
+        self.total = 0
+        
+        for node in nodes:
+            self.append(node)
+    
+    def __len__(self):
+        return len(self.ips)
+    
+    def append(self, node):
+        """Ajoute un node (dict de l'API) comme nouvelle ligne"""
+        row = len(self.ips)
+        get = node.get
+        
+        ip = get('ip', '')
+        self.ips.append(ip)
+        self.by_ip[ip] = row
+        
+        code = TIER_CODES.get(get('tier'), UNKNOWN_TIER)
+        self.tiers.append(code)
+        if code != UNKNOWN_TIER:
+            self.rows_by_tier[code].append(row)
+            self.tier_totals[code] += 1
+        
+        self.ranks.append(_int(get('rank')))
+        self.last_paid.append(_int(get('lastpaidheight')))
+        self.confirmed.append(_int(get('confirmedheight')))
+        self.last_confirmed.append(_int(get('lastconfirmedheight')))
+        self.added.append(_int(get('addedheight')))
+        
+        txhash = get('txhash')
+        self.txhashes.append(txhash)
+        collateral = get('collateral')
+        output = -1
+        if collateral is not None:
+            output = _collateral_output(collateral, txhash)
+            if output == -1:
+                self.collateral_overrides[row] = collateral
+        self.collateral_outputs.append(output)
+        
+        address = get('payment_address')
+        self.addresses.append(address)
+        if address:
+            rows = self.by_address.get(address)
+            if rows is None:
+                self.by_address[address] = row
+            elif isinstance(rows, list):
+                rows.append(row)
+            else:
+                self.by_address[address] = [rows, row]
+        
+        self.total += 1
+    
+    @property
+    def tier_counts(self):
+        """Nombre de nodes par tier"""
+        return dict(zip(TIERS, self.tier_totals))
+    
+    def record(self, row):
+        """Reconstruit le dict d'un node (champs absents omis)"""
+        code = self.tiers[row]
+        node = {
+            'ip': self.ips[row],
+            'tier': TIERS[code] if code != UNKNOWN_TIER else 'unknown',
+        }
+        for field, column in (
+            ('rank', self.ranks),
+            ('lastpaidheight', self.last_paid),
+            ('confirmedheight', self.confirmed),
+            ('lastconfirmedheight', self.last_confirmed),
+            ('addedheight', self.added),
+        ):
+            if column[row] != -1:
+                node[field] = column[row]
+        
+        if self.addresses[row] is not None:
+            node['payment_address'] = self.addresses[row]
+        txhash = self.txhashes[row]
+        if txhash is not None:
+            node['txhash'] = txhash
+        if self.collateral_outputs[row] != -1:
+            node['collateral'] = f"{_COLLATERAL_PREFIX}{txhash}, {self.collateral_outputs[row]})"
+        elif row in self.collateral_overrides:
+            node['collateral'] = self.collateral_overrides[row]
+        return node
+    
+    def row(self, node_ip):
+        """
+        Retrouve la ligne d'un node par "ip:port"
+        
+        Si le port configuré ne correspond pas à celui de la liste (port par
+        défaut omis par le daemon), retombe sur une recherche par IP seule.
+        """
+        row = self.by_ip.get(node_ip)
+        if row is None:
+            host = _host(node_ip)
+            row = self.by_ip.get(host)
+            if row is None:
+                if self._by_host is None:
+                    # Index par IP construit seulement si une recherche en a besoin
+                    self._by_host = {}
+                    for index, ip in enumerate(self.ips):
+                        self._by_host.setdefault(_host(ip), index)
+                row = self._by_host.get(host)
+        return row
+    
+    def get(self, node_ip):
+        """Retrouve un node par "ip:port" (voir row)"""
+        row = self.row(node_ip)
+        return self.record(row) if row is not None else None
+    
+    def rows_for_address(self, address):
+        """Retourne les lignes des nodes payés à une adresse"""
+        rows = self.by_address.get(address)
+        if rows is None:
+            return []
+        return rows if isinstance(rows, list) else [rows]
+    
+    def as_dict(self, node_ips):
+        """
+        Exporte l'index pour la persistance
+        
+        Seuls les nodes configurés sont conservés ; les compteurs du réseau
+        complet sont exportés tels quels.
+        """
+        nodes = [self.get(node_ip) for node_ip in node_ips]
+        return {
+            'nodes': [node for node in nodes if node is not None],
+            'tier_counts': self.tier_counts,
+            'total': self.total,
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruit un index partiel exporté par as_dict"""
+        snapshot = cls(data['nodes'])
+        snapshot.tier_totals = [data['tier_counts'].get(tier, 0) for tier in TIERS]
+        snapshot.total = data['total']
+        return snapshot
+
+
+class BenchmarkStats:
+    """
+    Compteurs de la liste des benchmarks du réseau
+    
+    Mis à jour à chaque benchmark ajouté à l'index, pendant le décodage en
+    flux : versions FluxOS et benchmark, statuts et nombre d'applications.
+    """
+    
+    __slots__ = ('nodes', 'flux_versions', 'bench_versions', 'statuses', 'apps', 'nodes_with_apps')
+    
+    def __init__(self):
+        self.nodes = 0
+        self.flux_versions = Counter()
+        self.bench_versions = Counter()
+        self.statuses = Counter()
+        self.apps = 0
+        self.nodes_with_apps = 0
+    
+    def add(self, benchmark):
+        """Compte un benchmark (format projeté de /flux/benchmarks)"""
+        self.nodes += 1
+        flux_version = (benchmark.get('flux') or {}).get('version')
+        if flux_version:
+            self.flux_versions[flux_version] += 1
+        bench = benchmark.get('bench') or {}
+        if bench.get('version'):
+            self.bench_versions[bench['version']] += 1
+        if bench.get('status'):
+            self.statuses[str(bench['status']).upper()] += 1
+        apps = len(benchmark.get('apps') or ())
+        self.apps += apps
+        if apps:
+            self.nodes_with_apps += 1
+    
+    @property
+    def benchmarked(self):
+        """Nombre de nodes avec un statut de benchmark"""
+        return sum(self.statuses.values())
+    
+    @property
+    def failed(self):
+        """Nombre de nodes dont le benchmark n'atteint aucun tier"""
+        return sum(count for status, count in self.statuses.items() if status not in TIERS)
+    
+    def as_dict(self):
+        """Exporte les compteurs pour la persistance"""
+        return {
+            'nodes': self.nodes,
+            'flux_versions': dict(self.flux_versions),
+            'bench_versions': dict(self.bench_versions),
+            'statuses': dict(self.statuses),
+            'apps': self.apps,
+            'nodes_with_apps': self.nodes_with_apps,
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruit des compteurs exportés par as_dict"""
+        stats = cls()
+        stats.nodes = data['nodes']
+        stats.flux_versions = Counter(data['flux_versions'])
+        stats.bench_versions = Counter(data['bench_versions'])
+        stats.statuses = Counter(data['statuses'])
+        stats.apps = data['apps']
+        stats.nodes_with_apps = data['nodes_with_apps']
+        return stats
+
+
+class BenchmarkIndex:
+    """Liste des benchmarks du réseau indexée par "ip:port" et par IP"""
+    
+    def __init__(self, benchmarks=()):
+        self.by_ip = {}
+        self.by_host = {}
+        # Compteurs du réseau, tenus pendant la même passe que les index
+        self.stats = BenchmarkStats()
+        
+        for benchmark in benchmarks:
+            self.append(benchmark)
+    
+    def __len__(self):
+        return len(self.by_ip)
+    
+    def append(self, benchmark):
+        """Ajoute un benchmark (collecteur du décodage en flux)"""
+        ip = benchmark.get('ip', '')
+        if ip not in self.by_ip:
+            self.stats.add(benchmark)
+        self.by_ip[ip] = benchmark
+        self.by_host.setdefault(_host(ip), benchmark)
+    
+    def get(self, node_ip):
+        """Retrouve le benchmark d'un node par "ip:port", sinon par IP seule"""
+        benchmark = self.by_ip.get(node_ip)
+        if benchmark is None:
+            benchmark = self.by_host.get(_host(node_ip))
+        return benchmark
+    
+    def as_list(self, node_ips):
+        """Exporte les benchmarks des nodes configurés pour la persistance"""
+        benchmarks = [self.get(node_ip) for node_ip in node_ips]
+        return [benchmark for benchmark in benchmarks if benchmark is not None]
+
+
+# Champs conservés lors du décodage de la liste des nodes du réseau
+NODE_LIST_PROJECTION = {
+    'ip': None,
+    'tier': None,
+    'rank': None,
+    'lastpaidheight': None,
+    'confirmedheight': None,
+    'lastconfirmedheight': None,
+    'addedheight': None,
+    'payment_address': None,
+    'collateral': None,
+    'txhash': None,
+}
+
+# Champs conservés lors du décodage de la liste des benchmarks
+BENCHMARK_PROJECTION = {
+    'ip': None,
+    'flux': {'version': None},
+    'bench': {
+        'version': None,
+        'eps': None,
+        'ddwrite': None,
+        'download': None,
+        'upload': None,
+        'time': None,
+        'status': None,
+    },
+    'node': {'uptime': None},
+    'apps': {'name': None},
+}
@@ -0,0 +1,88 @@
+"""
+File d'attente des paiements des nodes Flux
+Construite une seule fois par liste des nodes téléchargée
+"""
+
+from array import array
+
+from .network import TIERS
+
+# Durée moyenne d'un bloc Flux (minutes)
+BLOCK_TIME_MINUTES = 2
+
+
+class PaymentQueue:
+    """
+    Ordre de paiement des nodes de chaque tier
+
+    Chaque bloc paie un node par tier : le premier de la file, c'est-à-dire
+    celui dont la dernière hauteur de paiement (ou de confirmation pour un
+    node jamais payé) est la plus ancienne. Chaque tier est trié une seule
+    fois ; la position d'un node est ensuite lue par son numéro de ligne.
+
+    La hauteur de référence est la plus haute hauteur de paiement de la
+    liste : chaque bloc miné depuis avance la file d'une place.
+    """
+
+    def __init__(self, snapshot=None):
+        # Position de chaque ligne du snapshot dans la file de son tier, -1 si hors file
+        self.positions = array('i')
+        self.lengths = dict.fromkeys(TIERS, 0)
+        self.height = 0
+
+        if snapshot is not None:
+            self._build(snapshot)
+
+    def _build(self, snapshot):
+        """Trie les nodes de chaque tier par ordre de paiement"""
+        last_paid = snapshot.last_paid
+        confirmed = snapshot.confirmed
+        self.positions = array('i', [-1]) * len(snapshot)
+        self.height = max(last_paid, default=0)
+
+        for code, rows in snapshot.rows_by_tier.items():
+            # À hauteur égale, l'ordre de la liste départage les nodes
+            order = sorted(rows, key=lambda row: max(last_paid[row], confirmed[row]))
+            for position, row in enumerate(order):
+                self.positions[row] = position
+            self.lengths[TIERS[code]] = len(order)
+
+    def position(self, row):
+        """Position d'une ligne dans la file de son tier (0 = prochain payé)"""
+        if row is None or row >= len(self.positions) or self.positions[row] == -1:
+            return None
+        return self.positions[row]
+
+    def blocks_until_payment(self, row, current_height):
+        """Nombre de blocs avant le paiement d'une ligne à la hauteur courante"""
+        position = self.position(row)
+        if position is None:
+            return None
+        elapsed = max(0, current_height - self.height)
+        return max(0, position + 1 - elapsed)
+
+    def as_dict(self, snapshot, node_ips):
+        """Exporte les positions des nodes suivis pour la persistance"""
+        positions = {}
+        for node_ip in node_ips:
+            position = self.position(snapshot.row(node_ip))
+            if position is not None:
+                positions[node_ip] = position
+        return {
+            'positions': positions,
+            'lengths': self.lengths,
+            'height': self.height,
+        }
+
+    @classmethod
+    def from_dict(cls, data, snapshot):
+        """Reconstruit la file des nodes exportés sur un snapshot partiel"""
+        queue = cls()
+        queue.positions = array('i', [-1]) * len(snapshot)
+        for node_ip, position in data['positions'].items():
+            row = snapshot.row(node_ip)
+            if row is not None:
+                queue.positions[row] = position
+        queue.lengths = dict(data['lengths'])
+        queue.height = data['height']
+        return queue
@@ -0,0 +1,89 @@
+"""
+Historique des prix journaliers du FLUX
+Téléchargé une fois par plage, conservé localement et complété jour après jour
+"""
+import time
+
+# Devise toujours suivie (sensors en EUR)
+DEFAULT_CURRENCY = 'eur'
+
+# Jours d'historique conservés (fenêtre des revenus mensuels et marge)
+PRICE_HISTORY_DAYS = 32
+
+
+def day_of(timestamp):
+    """Jour UTC (nombre de jours depuis l'epoch) d'un timestamp"""
+    return int(timestamp // 86400)
+
+
+class PriceHistory:
+    """
+    Prix moyen du FLUX par jour UTC, pour chaque devise
+
+    Seuls les jours terminés sont conservés : le jour en cours est valorisé
+    au prix courant. Une devise n'est re-téléchargée qu'à partir du premier
+    jour manquant.
+    """
+
+    def __init__(self, days=PRICE_HISTORY_DAYS):
+        self.days = days
+        # Devise -> {jour: prix moyen}
+        self.daily = {}
+
+    def missing_range(self, currency, now=None):
+        """
+        Plage (début, fin) en timestamps à télécharger pour une devise
+
+        Retourne None si tous les jours terminés de la fenêtre sont connus.
+        """
+        today = day_of(now if now is not None else time.time())
+        known = self.daily.get(currency) or {}
+        start = max(max(known, default=today - self.days - 1) + 1, today - self.days)
+        if start >= today:
+            return None
+        return start * 86400, today * 86400
+
+    def update(self, currency, points, now=None):
+        """
+        Ajoute les prix d'une plage téléchargée
+
+        points est la liste [[timestamp_ms, prix], ...] de CoinGecko ; les
+        points d'un même jour terminé sont moyennés.
+        """
+        today = day_of(now if now is not None else time.time())
+        sums = {}
+        for timestamp_ms, price in points:
+            day = day_of(timestamp_ms / 1000)
+            if day < today and price is not None:
+                total, count = sums.get(day, (0.0, 0))
+                sums[day] = (total + price, count + 1)
+
+        known = self.daily.setdefault(currency, {})
+        for day, (total, count) in sums.items():
+            known[day] = total / count
+        self.evict(now)
+
+    def evict(self, now=None):
+        """Oublie les jours sortis de la fenêtre"""
+        first_day = day_of(now if now is not None else time.time()) - self.days
+        for currency, known in self.daily.items():
+            self.daily[currency] = {day: price for day, price in known.items() if day >= first_day}
+
+    def price_on(self, currency, day):
+        """Prix moyen d'un jour, None s'il est inconnu"""
+        return (self.daily.get(currency) or {}).get(day)
+
+    def as_dict(self):
+        """Exporte l'historique pour la persistance (clés JSON en texte)"""
+        return {
+            currency: {str(day): price for day, price in known.items()}
+            for currency, known in self.daily.items()
+        }
+
+    def restore(self, data):
+        """Restaure un historique exporté par as_dict"""
+        self.daily = {
+            currency: {int(day): price for day, price in known.items()}
+            for currency, known in data.items()
+        }
+        self.evict()
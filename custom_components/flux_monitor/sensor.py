@@ -7,11 +7,86 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    ECOSYSTEM_SENSOR_SOURCES,
+    NODE_SENSOR_SOURCES,
+    SOURCE_BLOCK_HEIGHT,
+    SOURCE_NODES,
+    SOURCE_PARALLEL_ASSETS,
+    WALLET_SENSOR_SOURCES,
+)
+
+
+NODE_SENSORS = (
+    ("next_payment", "Next Payment", None),
+    ("rank", "Rank", None),
+    ("tier", "Tier", None),
+    ("ip_port", "IP:Port", None),
+    ("flux_os_version", "FluxOS Version", None),
+    ("benchmark_version", "Benchmark Version", None),
+    ("eps", "EPS", None),
+    ("dws", "DWS", "MB/s"),
+    ("download", "Download", "Mbps"),
+    ("upload", "Upload", "Mbps"),
+    ("last_benchmark", "Last Benchmark", None),
+    ("uptime", "Uptime", "s"),
+    ("score", "Score", None),
+    ("apps", "Apps Count", None),
+    ("blocks_until_payment", "Blocks Until Payment", "blocks"),
+    ("health", "Health", None),
+)
+
+# Node sensors carrying rolling statistics of their benchmark history
+HISTORY_SENSORS = ("eps", "dws", "download", "upload", "uptime")
+
+ECOSYSTEM_SENSORS = (
+    ("cumulus", "Cumulus Nodes", "nodes"),
+    ("nimbus", "Nimbus Nodes", "nodes"),
+    ("stratus", "Stratus Nodes", "nodes"),
+    ("total", "Total Nodes", "nodes"),
+    ("payout_interval_cumulus", "Cumulus Payout Interval", "h"),
+    ("payout_interval_nimbus", "Nimbus Payout Interval", "h"),
+    ("payout_interval_stratus", "Stratus Payout Interval", "h"),
+    ("benchmark_failed_pct", "Failed Benchmarks", "%"),
+    ("flux_os_version", "FluxOS Version", None),
+    ("benchmark_version", "Benchmark Version", None),
+    ("apps_per_node", "Apps Per Node", "apps"),
+)
+
+# Attributes of each ecosystem sensor, read from the same ecosystem stats
+ECOSYSTEM_ATTRIBUTES = {
+    "total": ("cumulus", "nimbus", "stratus"),
+    "payout_interval_cumulus": ("queue_length_cumulus",),
+    "payout_interval_nimbus": ("queue_length_nimbus",),
+    "payout_interval_stratus": ("queue_length_stratus",),
+    "benchmark_failed_pct": ("benchmarked_nodes", "benchmark_failed", "benchmark_statuses"),
+    "flux_os_version": ("flux_os_versions",),
+    "benchmark_version": ("benchmark_versions",),
+    "apps_per_node": ("apps_total", "nodes_with_apps_pct"),
+}
+
+
+def node_unique_id(entry_id: str, node_key: str, sensor_key: str) -> str:
+    """Return the unique ID of a node sensor."""
+    return f"{entry_id}_node_{node_key}_{sensor_key}"
+
+
+def _node_key_from_unique_id(entry_id: str, unique_id: str) -> str | None:
+    """Return the node key encoded in a node sensor unique ID."""
+    prefix = f"{entry_id}_node_"
+    if not unique_id.startswith(prefix):
+        return None
+    for sensor_key, _, _ in NODE_SENSORS:
+        if unique_id.endswith(f"_{sensor_key}"):
+            return unique_id[len(prefix):-len(sensor_key) - 1]
+    return None
 
 
 async def async_setup_entry(
@@ -20,70 +95,158 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Flux Monitor sensors."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    coordinators = hass.data[DOMAIN][entry.entry_id]["coordinators"]
+    monitor = hass.data[DOMAIN][entry.entry_id]["monitor"]
     
-    sensors = []
+    # La liste des nodes suit la source "nodes" : les entités sont ajoutées ou
+    # retirées à chacune de ses mises à jour, sans recharger l'intégration
+    coordinator = coordinators[SOURCE_NODES]
+    node_entities: dict[str, list[FluxNodeSensor]] = {}
     
-    # Sensors pour chaque node
-    if coordinator.data and "nodes" in coordinator.data:
-        for idx, node_data in enumerate(coordinator.data["nodes"]):
-            node_ip = node_data.get("ip_port", f"node_{idx}")
-            
-            # Sensors individuels pour chaque node
-            sensors.extend([
-                FluxNodeSensor(coordinator, entry, idx, "next_payment", "Next Payment", None),
-                FluxNodeSensor(coordinator, entry, idx, "rank", "Rank", None),
-                FluxNodeSensor(coordinator, entry, idx, "tier", "Tier", None),
-                FluxNodeSensor(coordinator, entry, idx, "ip_port", "IP:Port", None),
-                FluxNodeSensor(coordinator, entry, idx, "flux_os_version", "FluxOS Version", None),
-                FluxNodeSensor(coordinator, entry, idx, "benchmark_version", "Benchmark Version", None),
-                FluxNodeSensor(coordinator, entry, idx, "eps", "EPS", None),
-                FluxNodeSensor(coordinator, entry, idx, "dws", "DWS", "MB/s"),
-                FluxNodeSensor(coordinator, entry, idx, "download", "Download", "Mbps"),
-                FluxNodeSensor(coordinator, entry, idx, "upload", "Upload", "Mbps"),
-                FluxNodeSensor(coordinator, entry, idx, "last_benchmark", "Last Benchmark", None),
-                FluxNodeSensor(coordinator, entry, idx, "uptime", "Uptime", "s"),
-                FluxNodeSensor(coordinator, entry, idx, "score", "Score", None),
-                FluxNodeSensor(coordinator, entry, idx, "apps", "Apps Count", None),
-                FluxNodeSensor(coordinator, entry, idx, "blocks_until_payment", "Blocks Until Payment", "blocks"),
-            ])
+    @callback
+    def async_sync_nodes() -> None:
+        """Add entities for new nodes and retire those of vanished nodes."""
+        nodes = coordinator.data.get("nodes", {}) if coordinator.data else {}
+        
+        sensors = []
+        for node_key in nodes:
+            if node_key in node_entities:
+                continue
+            if node_key in monitor.configured_ips:
+                label = str(monitor.configured_ips.index(node_key) + 1)
+            else:
+                label = node_key
+            node_entities[node_key] = [
+                FluxNodeSensor(coordinators, entry, node_key, label, sensor_key, sensor_name, unit)
+                for sensor_key, sensor_name, unit in NODE_SENSORS
+            ]
+            sensors.extend(node_entities[node_key])
+        if sensors:
+            async_add_entities(sensors)
+        
+        # Un node configuré absent de la liste reste indisponible ; seuls les
+        # nodes qui ne sont plus suivis sont retirés
+        retired = [
+            node_key for node_key in node_entities
+            if node_key not in nodes and node_key not in monitor.node_ips
+        ]
+        for node_key in retired:
+            for sensor in node_entities.pop(node_key):
+                _async_retire(hass, sensor)
+    
+    # Retire les entités enregistrées de nodes qui ne sont plus suivis
+    keep = set(monitor.node_ips)
+    if coordinator.data:
+        keep.update(coordinator.data.get("nodes", {}))
+    ent_reg = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(ent_reg, entry.entry_id):
+        node_key = _node_key_from_unique_id(entry.entry_id, entity_entry.unique_id)
+        if node_key is not None and node_key not in keep:
+            ent_reg.async_remove(entity_entry.entity_id)
+    
+    async_sync_nodes()
+    entry.async_on_unload(coordinator.async_add_listener(async_sync_nodes))
+    
+    sensors = []
     
     # Sensors pour le wallet
     sensors.extend([
-        FluxWalletSensor(coordinator, entry, "balance_flux", "Balance", "FLUX"),
-        FluxWalletSensor(coordinator, entry, "balance_eur", "Balance EUR", "EUR"),
-        FluxWalletSensor(coordinator, entry, "monthly_flux", "Monthly Rewards", "FLUX"),
-        FluxWalletSensor(coordinator, entry, "monthly_eur", "Monthly Rewards EUR", "EUR"),
-        FluxWalletSensor(coordinator, entry, "flux_price_eur", "FLUX Price", "EUR"),
+        FluxWalletSensor(coordinators, entry, "balance_flux", "Balance", "FLUX"),
+        FluxWalletSensor(coordinators, entry, "balance_eur", "Balance EUR", "EUR"),
+        FluxWalletSensor(coordinators, entry, "monthly_flux", "Monthly Rewards", "FLUX"),
+        FluxWalletSensor(coordinators, entry, "monthly_eur", "Monthly Rewards EUR", "EUR"),
+        FluxWalletSensor(coordinators, entry, "flux_price_eur", "FLUX Price", "EUR"),
     ])
     
     # Sensors pour les Parallel Assets
     sensors.extend([
-        FluxParallelAssetSensor(coordinator, entry, "total_assets", "Total Assets", None),
-        FluxParallelAssetSensor(coordinator, entry, "total_value", "Total Value", None),
+        FluxParallelAssetSensor(coordinators, entry, "total_assets", "Total Assets", None),
+        FluxParallelAssetSensor(coordinators, entry, "total_value", "Total Value", None),
     ])
     
     # Sensors pour l'écosystème
     sensors.extend([
-        FluxEcosystemSensor(coordinator, entry, "cumulus", "Cumulus Nodes", "nodes"),
-        FluxEcosystemSensor(coordinator, entry, "nimbus", "Nimbus Nodes", "nodes"),
-        FluxEcosystemSensor(coordinator, entry, "stratus", "Stratus Nodes", "nodes"),
-        FluxEcosystemSensor(coordinator, entry, "total", "Total Nodes", "nodes"),
+        FluxEcosystemSensor(coordinators, entry, sensor_key, sensor_name, unit)
+        for sensor_key, sensor_name, unit in ECOSYSTEM_SENSORS
+    ])
+    
+    # Sensors de diagnostic (instrumentation des appels API)
+    sensors.extend([
+        FluxDiagnosticSensor(coordinators, entry, monitor, "refresh_duration", "Refresh Duration", "s"),
+        FluxDiagnosticSensor(coordinators, entry, monitor, "api_requests", "API Requests", None),
+        FluxDiagnosticSensor(coordinators, entry, monitor, "api_errors", "API Errors", None),
+        FluxDiagnosticSensor(coordinators, entry, monitor, "api_latency_p95", "API Latency P95", "ms"),
+        FluxDiagnosticSensor(coordinators, entry, monitor, "http_retries", "HTTP Retries", None),
+        FluxDiagnosticSensor(coordinators, entry, monitor, "cache_hits", "Cache Hits", None),
     ])
     
     async_add_entities(sensors)
 
 
-class FluxNodeSensor(CoordinatorEntity, SensorEntity):
+@callback
+def _async_retire(hass: HomeAssistant, sensor: SensorEntity) -> None:
+    """Remove a sensor from Home Assistant and from the entity registry."""
+    ent_reg = er.async_get(hass)
+    if sensor.entity_id and ent_reg.async_get(sensor.entity_id):
+        # Le registre retire aussi l'entité de Home Assistant
+        ent_reg.async_remove(sensor.entity_id)
+    else:
+        hass.async_create_task(sensor.async_remove())
+
+
+class FluxSensor(CoordinatorEntity, SensorEntity):
+    """Base class for Flux Monitor sensors."""
+
+    _last_written = None
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_written = (self.available, self.native_value, self.extra_state_attributes)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this sensor's value, attributes or availability changed."""
+        if (
+            self._last_written is not None
+            and self._last_written[0] == self.available
+            and not self._affected_by_update()
+        ):
+            return
+
+        written = (self.available, self.native_value, self.extra_state_attributes)
+        if written == self._last_written:
+            return
+        self._last_written = written
+        self.async_write_ha_state()
+
+    def _affected_by_update(self) -> bool:
+        """Return whether the last coordinator update may have changed this sensor."""
+        return True
+
+    @property
+    def extra_state_attributes(self):
+        """Return extra attributes, flagging values restored from the last snapshot."""
+        attrs = self._extra_attributes()
+        if self.coordinator.data and self.coordinator.data.get("stale"):
+            attrs = {**attrs, "stale": True}
+        return attrs
+
+    def _extra_attributes(self):
+        """Return sensor specific attributes."""
+        return {}
+
+
+class FluxNodeSensor(FluxSensor):
     """Representation of a Flux Node sensor."""
 
-    def __init__(self, coordinator, config_entry, node_idx, sensor_key, sensor_name, unit):
+    def __init__(self, coordinators, config_entry, node_key, label, sensor_key, sensor_name, unit):
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._node_idx = node_idx
+        super().__init__(coordinators[NODE_SENSOR_SOURCES[sensor_key]])
+        self._node_key = node_key
         self._sensor_key = sensor_key
-        self._attr_name = f"Flux Node {node_idx + 1} {sensor_name}"
-        self._attr_unique_id = f"{config_entry.entry_id}_node_{node_idx}_{sensor_key}"
+        self._attr_name = f"Flux Node {label} {sensor_name}"
+        self._attr_unique_id = node_unique_id(config_entry.entry_id, node_key, sensor_key)
         self._attr_native_unit_of_measurement = unit
         
         if sensor_key in ["balance_flux", "balance_eur", "monthly_flux", "monthly_eur"]:
@@ -91,46 +254,68 @@ class FluxNodeSensor(CoordinatorEntity, SensorEntity):
         elif sensor_key in ["eps", "dws", "download", "upload", "uptime", "apps", "blocks_until_payment"]:
             self._attr_state_class = SensorStateClass.MEASUREMENT
 
+    def _affected_by_update(self):
+        """Return whether the last update changed this node."""
+        return self.coordinator.node_changed(self._node_key)
+
+    def _node_data(self):
+        """Return the data of this node, if it is in the last update."""
+        if self.coordinator.data and "nodes" in self.coordinator.data:
+            return self.coordinator.data["nodes"].get(self._node_key)
+        return None
+
+    @property
+    def available(self):
+        """Return True if the node is present in the last update."""
+        return super().available and self._node_data() is not None
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self.coordinator.data and "nodes" in self.coordinator.data:
-            if self._node_idx < len(self.coordinator.data["nodes"]):
-                node_data = self.coordinator.data["nodes"][self._node_idx]
-                return node_data.get(self._sensor_key, "Unknown")
+        node_data = self._node_data()
+        if node_data is not None:
+            return node_data.get(self._sensor_key, "Unknown")
         return "Unknown"
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self.coordinator.data and "nodes" in self.coordinator.data:
-            if self._node_idx < len(self.coordinator.data["nodes"]):
-                node_data = self.coordinator.data["nodes"][self._node_idx]
-                
-                attrs = {
-                    "ip_port": node_data.get("ip_port", "N/A"),
-                    "tier": node_data.get("tier", "N/A"),
-                    "rank": node_data.get("rank", "N/A"),
-                }
-                
-                # Ajoute la liste des apps si disponible
-                if self._sensor_key == "apps" and "apps_list" in node_data:
-                    attrs["apps_list"] = node_data["apps_list"]
-                
-                # Ajoute des infos de collateral
-                if "collateral" in node_data:
-                    attrs["collateral"] = node_data["collateral"]
-                
-                return attrs
+    def _extra_attributes(self):
+        """Return sensor specific attributes."""
+        node_data = self._node_data()
+        if node_data is not None:
+            attrs = {
+                "ip_port": node_data.get("ip_port", "N/A"),
+                "tier": node_data.get("tier", "N/A"),
+                "rank": node_data.get("rank", "N/A"),
+            }
+            
+            # Ajoute les statistiques glissantes de l'historique du node
+            if self._sensor_key in HISTORY_SENSORS:
+                rolling = node_data.get("rolling", {}).get(self._sensor_key) or {}
+                for window, stats in rolling.items():
+                    for stat, value in (stats or {}).items():
+                        attrs[f"{stat}_{window}"] = round(value, 2)
+            
+            if self._sensor_key == "health":
+                attrs["degradations"] = node_data.get("degradations", [])
+            
+            # Ajoute la position dans la file de paiement du tier
+            if self._sensor_key in ("next_payment", "blocks_until_payment"):
+                attrs["queue_position"] = node_data.get("queue_position")
+                attrs["queue_length"] = node_data.get("queue_length")
+            
+            # Ajoute des infos de collateral
+            if "collateral" in node_data:
+                attrs["collateral"] = node_data["collateral"]
+            
+            return attrs
         return {}
 
 
-class FluxWalletSensor(CoordinatorEntity, SensorEntity):
+class FluxWalletSensor(FluxSensor):
     """Representation of a Flux Wallet sensor."""
 
-    def __init__(self, coordinator, config_entry, sensor_key, sensor_name, unit):
+    def __init__(self, coordinators, config_entry, sensor_key, sensor_name, unit):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinators[WALLET_SENSOR_SOURCES[sensor_key]])
         self._sensor_key = sensor_key
         self._attr_name = f"Flux Wallet {sensor_name}"
         self._attr_unique_id = f"{config_entry.entry_id}_wallet_{sensor_key}"
@@ -142,6 +327,10 @@ class FluxWalletSensor(CoordinatorEntity, SensorEntity):
         if unit == "EUR":
             self._attr_device_class = SensorDeviceClass.MONETARY
 
+    def _affected_by_update(self):
+        """Return whether the last update changed the wallet."""
+        return self.coordinator.section_changed("wallet")
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -152,19 +341,44 @@ class FluxWalletSensor(CoordinatorEntity, SensorEntity):
             return value
         return 0
 
+    def _extra_attributes(self):
+        """Return the value in the other configured currencies."""
+        if not self.coordinator.data or "wallet" not in self.coordinator.data:
+            return {}
+        fiat = self.coordinator.data["wallet"].get("fiat", {})
+        field = {
+            "balance_eur": "balance",
+            "monthly_eur": "monthly",
+            "flux_price_eur": "price",
+        }.get(self._sensor_key)
+        if field is None:
+            return {}
+        attrs = {
+            f"{field}_{currency}": round(values[field], 4 if field == "price" else 2)
+            for currency, values in fiat.items()
+            if currency != "eur"
+        }
+        if self._sensor_key == "monthly_eur":
+            attrs["valuation"] = "payout_day_price"
+        return attrs
+
 
-class FluxParallelAssetSensor(CoordinatorEntity, SensorEntity):
+class FluxParallelAssetSensor(FluxSensor):
     """Representation of a Flux Parallel Asset sensor."""
 
-    def __init__(self, coordinator, config_entry, sensor_key, sensor_name, unit):
+    def __init__(self, coordinators, config_entry, sensor_key, sensor_name, unit):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinators[SOURCE_PARALLEL_ASSETS])
         self._sensor_key = sensor_key
         self._attr_name = f"Flux {sensor_name}"
         self._attr_unique_id = f"{config_entry.entry_id}_pa_{sensor_key}"
         self._attr_native_unit_of_measurement = unit
         self._attr_state_class = SensorStateClass.MEASUREMENT
 
+    def _affected_by_update(self):
+        """Return whether the last update changed the Parallel Assets."""
+        return self.coordinator.section_changed("parallel_assets")
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -172,27 +386,24 @@ class FluxParallelAssetSensor(CoordinatorEntity, SensorEntity):
             return self.coordinator.data["parallel_assets"].get(self._sensor_key, 0)
         return 0
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self.coordinator.data and "parallel_assets" in self.coordinator.data:
-            pa_data = self.coordinator.data["parallel_assets"]
-            if "assets_detail" in pa_data and self._sensor_key == "total_assets":
-                return {"assets_detail": pa_data["assets_detail"]}
-        return {}
-
 
-class FluxEcosystemSensor(CoordinatorEntity, SensorEntity):
+class FluxEcosystemSensor(FluxSensor):
     """Representation of a Flux Ecosystem sensor."""
 
-    def __init__(self, coordinator, config_entry, sensor_key, sensor_name, unit):
+    def __init__(self, coordinators, config_entry, sensor_key, sensor_name, unit):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinators[ECOSYSTEM_SENSOR_SOURCES.get(sensor_key, SOURCE_NODES)])
         self._sensor_key = sensor_key
         self._attr_name = f"Flux Ecosystem {sensor_name}"
         self._attr_unique_id = f"{config_entry.entry_id}_eco_{sensor_key}"
         self._attr_native_unit_of_measurement = unit
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+        # Les versions sont des états textuels
+        if unit is not None:
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    def _affected_by_update(self):
+        """Return whether the last update changed the ecosystem stats."""
+        return self.coordinator.section_changed("ecosystem")
 
     @property
     def native_value(self):
@@ -201,15 +412,88 @@ class FluxEcosystemSensor(CoordinatorEntity, SensorEntity):
             return self.coordinator.data["ecosystem"].get(self._sensor_key, 0)
         return 0
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
+    def _extra_attributes(self):
+        """Return sensor specific attributes."""
         if self.coordinator.data and "ecosystem" in self.coordinator.data:
             eco_data = self.coordinator.data["ecosystem"]
-            if self._sensor_key == "total":
-                return {
-                    "cumulus": eco_data.get("cumulus", 0),
-                    "nimbus": eco_data.get("nimbus", 0),
-                    "stratus": eco_data.get("stratus", 0),
-                }
+            return {
+                key: eco_data.get(key)
+                for key in ECOSYSTEM_ATTRIBUTES.get(self._sensor_key, ())
+            }
+        return {}
+
+
+class FluxDiagnosticSensor(FluxSensor):
+    """
+    Representation of a Flux Monitor diagnostic sensor.
+
+    The counters cover every source; the sensor follows the most frequent
+    coordinator (block height) so it picks up the other sources' requests
+    within one block height interval.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinators, config_entry, monitor, sensor_key, sensor_name, unit):
+        """Initialize the sensor."""
+        super().__init__(coordinators[SOURCE_BLOCK_HEIGHT])
+        self._metrics = monitor.metrics
+        self._cache = monitor.cache
+        self._sensor_key = sensor_key
+        self._attr_name = f"Flux Diagnostics {sensor_name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_diag_{sensor_key}"
+        self._attr_native_unit_of_measurement = unit
+        
+        if sensor_key in ["refresh_duration", "api_latency_p95"]:
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+        else:
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        metrics = self._metrics
+        if self._sensor_key == "refresh_duration":
+            duration = metrics.refresh_durations.get("all")
+            return round(duration, 3) if duration is not None else None
+        if self._sensor_key == "api_requests":
+            return metrics.requests
+        if self._sensor_key == "api_errors":
+            return metrics.errors
+        if self._sensor_key == "api_latency_p95":
+            p95 = metrics.latency_p95()
+            return round(p95 * 1000) if p95 is not None else None
+        if self._sensor_key == "http_retries":
+            return metrics.retries
+        if self._sensor_key == "cache_hits":
+            return metrics.cache_hits
+        return None
+
+    def _extra_attributes(self):
+        """Return the per source or per endpoint breakdown."""
+        endpoints = self._metrics.endpoints
+        if self._sensor_key == "refresh_duration":
+            return {
+                source: round(duration, 3)
+                for source, duration in self._metrics.refresh_durations.items()
+            }
+        if self._sensor_key == "api_requests":
+            return {name: stats.requests for name, stats in endpoints.items()}
+        if self._sensor_key == "api_errors":
+            return {
+                name: dict(stats.errors)
+                for name, stats in endpoints.items()
+                if stats.errors
+            }
+        if self._sensor_key == "api_latency_p95":
+            attrs = {}
+            for name, stats in endpoints.items():
+                p95 = stats.latency_quantile(0.95)
+                if p95 is not None:
+                    attrs[name] = round(p95 * 1000)
+            return attrs
+        if self._sensor_key == "http_retries":
+            return {name: stats.retries for name, stats in endpoints.items() if stats.retries}
+        if self._sensor_key == "cache_hits":
+            return self._cache.stats()
         return {}
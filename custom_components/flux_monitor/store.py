@@ -0,0 +1,79 @@
+"""Persistent snapshot of the last Flux Monitor refresh."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, NETWORK
+from .flux_api import FluxMonitor, FluxNetworkClient
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 300
+
+
+class FluxSnapshotStore:
+    """Persist the last data view and the caches behind it.
+
+    The snapshot is built from a source by _payload: an entry's monitor here,
+    the shared network client in FluxNetworkStore.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._save_pending = False
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the last saved snapshot."""
+        return await self._store.async_load()
+
+    def async_schedule_save(self, source: FluxMonitor | FluxNetworkClient) -> None:
+        """Save the snapshot at most SAVE_DELAY after the first unsaved update.
+
+        Store.async_delay_save pushes its deadline back on every call, so with
+        sources updating more often than SAVE_DELAY nothing would be written
+        until unload. Later updates join the pending save instead; the
+        payload is built when it is written.
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+
+        def payload() -> dict[str, Any]:
+            self._save_pending = False
+            return self._payload(source)
+
+        self._store.async_delay_save(payload, SAVE_DELAY)
+
+    async def async_save(self, source: FluxMonitor | FluxNetworkClient) -> None:
+        """Save the snapshot now."""
+        # Replaces any pending delayed save
+        self._save_pending = False
+        await self._store.async_save(self._payload(source))
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot file."""
+        await self._store.async_remove()
+
+    @staticmethod
+    def _payload(source: FluxMonitor) -> dict[str, Any]:
+        """Build the data to persist from an entry's monitor."""
+        return {
+            "data": source.build_data(),
+            "state": source.export_state(),
+        }
+
+
+class FluxNetworkStore(FluxSnapshotStore):
+    """Persist the network data of the shared client."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        super().__init__(hass, NETWORK)
+
+    @staticmethod
+    def _payload(source: FluxNetworkClient) -> dict[str, Any]:
+        """Build the data to persist from the shared client."""
+        return source.export_state()
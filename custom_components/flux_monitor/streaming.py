@@ -0,0 +1,109 @@
+"""
+Décodage incrémental des grosses réponses JSON de l'API Flux
+Lit le tableau "data" élément par élément et ne garde que les champs projetés
+"""
+import codecs
+import json
+import re
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[\s,]*')
+
+
+def compile_projection(spec):
+    """
+    Compile une projection en fonction
+    
+    spec est un dict {champ: sous-spec} ; une sous-spec None garde la valeur
+    telle quelle. Appliquée à une liste, la projection porte sur chaque élément.
+    """
+    if spec is None:
+        return lambda value: value
+    
+    flat = tuple(field for field, sub_spec in spec.items() if sub_spec is None)
+    nested = tuple((field, compile_projection(sub_spec)) for field, sub_spec in spec.items() if sub_spec is not None)
+    
+    def projector(value):
+        if isinstance(value, list):
+            return [projector(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = {field: value[field] for field in flat if field in value}
+        for field, sub_projector in nested:
+            if field in value:
+                result[field] = sub_projector(value[field])
+        return result
+    
+    return projector
+
+
+class JsonArrayStream:
+    """
+    Parseur incrémental de réponses de la forme {"status": ..., "key": [...]}
+    
+    Les morceaux reçus sont passés à feed() ; chaque élément complet du
+    tableau est décodé, projeté puis ajouté au collecteur (une liste par
+    défaut, ou tout objet ayant une méthode append), si bien que seul
+    l'élément en cours de lecture est conservé sous forme brute.
+    """
+    
+    def __init__(self, spec, collector=list, key='data'):
+        self._project = compile_projection(spec)
+        self.items = collector()
+        self.size = 0
+        self._array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._text = ''
+        self._in_array = False
+        self._done = False
+    
+    def feed(self, chunk):
+        """Ajoute un morceau de la réponse et décode les éléments complets"""
+        self.size += len(chunk)
+        if self._done:
+            return
+        self._text += self._utf8.decode(chunk)
+        
+        if not self._in_array:
+            match = self._array_start.search(self._text)
+            if match is None:
+                return
+            self._text = self._text[match.end():]
+            self._in_array = True
+        
+        self._decode_items()
+    
+    def _decode_items(self):
+        """Décode autant d'éléments complets que possible"""
+        text = self._text
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos >= len(text):
+                break
+            if text[pos] == ']':
+                self._done = True
+                pos = len(text)
+                break
+            try:
+                item, end = _DECODER.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                # Élément incomplet : attend le morceau suivant
+                break
+            self.items.append(self._project(item))
+            pos = end
+        self._text = text[pos:]
+    
+    def close(self):
+        """
+        Termine le décodage
+        
+        Retourne le collecteur rempli, ou None si le tableau est absent ou
+        tronqué.
+        """
+        self._text += self._utf8.decode(b'', final=True)
+        if self._in_array and not self._done:
+            self._decode_items()
+        if not self._done:
+            return None
+        return self.items
@@ -0,0 +1,134 @@
+"""
+Index incrémental des transactions du wallet
+Maintient la somme des revenus sur une fenêtre glissante
+"""
+from collections import deque
+import time
+
+SATOSHIS_PER_FLUX = 100000000
+
+
+class WalletTxIndexer:
+    """
+    Index des sorties reçues par une adresse sur une fenêtre glissante
+    
+    Le premier scan remonte les pages de l'explorer jusqu'à sortir de la
+    fenêtre. Les scans suivants s'arrêtent à la première transaction déjà
+    connue. Un scan interrompu par la limite de pages reprend à la page
+    suivante au prochain cycle, les transactions déjà lues restant en
+    attente. Les sorties expirées sont retirées de la somme au lieu de
+    recalculer la fenêtre complète.
+    """
+    
+    def __init__(self, address, window_days=30):
+        self.address = address
+        self.window = window_days * 86400
+        # txid -> blocktime des transactions déjà indexées
+        self.seen = {}
+        # (blocktime, montant en satoshis), du plus ancien au plus récent
+        self.outputs = deque()
+        self.total_sats = 0
+        # Jour UTC -> somme reçue ce jour-là (satoshis), pour la valorisation
+        self.daily_sats = {}
+        # Scan interrompu : page où reprendre et transactions lues, non intégrées
+        self.resume_page = 0
+        self.resume_pending = {}
+    
+    def cutoff(self, now=None):
+        """Retourne le timestamp de début de la fenêtre"""
+        return (now if now is not None else time.time()) - self.window
+    
+    def scan_page(self, txs, pending, now=None):
+        """
+        Ajoute à pending les transactions inconnues d'une page (la plus récente d'abord)
+        
+        Retourne True quand le scan peut s'arrêter : transaction déjà connue
+        ou transaction antérieure à la fenêtre.
+        """
+        cutoff = self.cutoff(now)
+        for tx in txs:
+            txid = tx.get('txid')
+            blocktime = tx.get('blocktime')
+            if not txid or not blocktime:
+                # Transaction non confirmée : elle sera indexée une fois minée
+                continue
+            if txid in self.seen:
+                return True
+            if blocktime < cutoff:
+                return True
+            if txid in pending:
+                # La pagination a glissé pendant le scan
+                continue
+            
+            received = 0
+            for vout in tx.get('vout', []):
+                if self.address in vout.get('scriptPubKey', {}).get('addresses', []):
+                    received += round(float(vout.get('value', 0)) * SATOSHIS_PER_FLUX)
+            pending[txid] = (blocktime, received)
+        return False
+    
+    def suspend(self, pending, page):
+        """Conserve un scan interrompu pour le reprendre à la page donnée"""
+        self.resume_page = page
+        self.resume_pending = pending
+    
+    def apply(self, pending, now=None):
+        """Intègre un scan terminé puis retire les sorties expirées"""
+        self.resume_page = 0
+        self.resume_pending = {}
+        for txid, (blocktime, received) in sorted(pending.items(), key=lambda item: item[1][0]):
+            self.seen[txid] = blocktime
+            if received:
+                self.outputs.append((blocktime, received))
+                self.total_sats += received
+                day = blocktime // 86400
+                self.daily_sats[day] = self.daily_sats.get(day, 0) + received
+        self.evict(now)
+    
+    def evict(self, now=None):
+        """Retire de la fenêtre les sorties et transactions expirées"""
+        cutoff = self.cutoff(now)
+        while self.outputs and self.outputs[0][0] < cutoff:
+            blocktime, received = self.outputs.popleft()
+            self.total_sats -= received
+            day = blocktime // 86400
+            self.daily_sats[day] -= received
+            if not self.daily_sats[day]:
+                del self.daily_sats[day]
+        self.seen = {txid: blocktime for txid, blocktime in self.seen.items() if blocktime >= cutoff}
+    
+    @property
+    def total(self):
+        """Somme reçue sur la fenêtre, en FLUX"""
+        return self.total_sats / SATOSHIS_PER_FLUX
+    
+    def value(self, price_on):
+        """
+        Valeur de la fenêtre, chaque jour étant valorisé à son propre prix
+        
+        price_on(jour) retourne le prix d'un jour UTC : les sorties étant
+        regroupées par jour, un seul prix par jour est nécessaire.
+        """
+        return sum(sats * price_on(day) for day, sats in self.daily_sats.items()) / SATOSHIS_PER_FLUX
+    
+    def as_dict(self):
+        """Exporte l'index pour la persistance"""
+        return {
+            'seen': self.seen,
+            'outputs': [list(output) for output in self.outputs],
+            'total_sats': self.total_sats,
+            'resume_page': self.resume_page,
+            'resume_pending': {txid: list(output) for txid, output in self.resume_pending.items()},
+        }
+    
+    def restore(self, data):
+        """Restaure un index exporté par as_dict"""
+        self.seen = dict(data['seen'])
+        self.outputs = deque(tuple(output) for output in data['outputs'])
+        self.total_sats = data['total_sats']
+        self.resume_page = data.get('resume_page', 0)
+        self.resume_pending = {txid: tuple(output) for txid, output in data.get('resume_pending', {}).items()}
+        self.daily_sats = {}
+        for blocktime, received in self.outputs:
+            day = blocktime // 86400
+            self.daily_sats[day] = self.daily_sats.get(day, 0) + received